@@ -1,14 +1,399 @@
-from authgraph.scanner.file_scanner import find_js_files
-from authgraph.scanner.express_parser import parse_express_code
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
+from typing import Dict, Iterator, List, Optional, Tuple
 
-def analyze_project(path):
-    all_routes = []
-    for file in find_js_files(path):
+from authgraph.core.cache import ParseCache, content_hash
+from authgraph.core.resolver import resolve_mounts
+from authgraph.scanner.file_scanner import DEFAULT_MAX_BYTES, iter_js_files
+from authgraph.scanner.express_parser import analyze_express_code, empty_result
+from authgraph.scanner.extractors import applicable
+from authgraph.scanner.js_lexer import ParseBudgetExceeded
+from authgraph.scanner.source_reader import ASCII_COMPATIBLE, decode_source, open_source, sniff_encoding
+
+# Bu sayının altındaki projelerde process pool açmak taramadan pahalı
+MIN_PARALLEL_FILES = 64
+DEFAULT_CHUNKSIZE = 32
+
+# Dosya başına parse süresi sınırı (saniye); aşan dosya atlanıp rapora yazılır
+FILE_TIME_BUDGET = float(os.getenv("AUTHGRAPH_FILE_TIME_BUDGET", "10"))
+
+# Rapordaki atlama sebebi (boyut sınırı için file_scanner "size" yazar)
+SKIP_TIME = "time"
+
+
+class ScanReport:
+    """Bir taramada okunamayan / parse edilemeyen dosyaların toplandığı rapor."""
+
+    def __init__(self):
+        self.files = 0
+        self.cached = 0
+        self.ai_files = 0
+        self.errors: List[Dict] = []
+        self.skipped: List[Dict] = []
+        self.warnings: List[Dict] = []
+
+    def add_error(self, file: str, error: str):
+        self.errors.append({"file": file, "error": error})
+
+    def add_warning(self, file: str, warning: str):
+        """Dosya tarandı ama sonuç eksik olabilir (ör. kodlama hatası, bkz. decode_error)."""
+        self.warnings.append({"file": file, "warning": warning})
+
+    def add_skipped(self, file: str, reason: str):
+        self.skipped.append({"file": file, "reason": reason})
+
+    def to_dict(self) -> Dict:
+        return {"files": self.files, "cached": self.cached, "ai_files": self.ai_files,
+                "errors": list(self.errors), "skipped": list(self.skipped), "warnings": list(self.warnings)}
+
+
+def _analyze_raw(data, name: str, time_budget: Optional[float], timings: Dict[str, float]) -> Dict:
+    """
+    Ham içerik (bytes / mmap) için ön filtre + çözme + analiz. ASCII uyumlu
+    kodlamada ön filtre baytlar üzerinde çalışır; rota içermeyen dosya hiç
+    str'ye çevrilmez. Kodlama hatası dosyayı düşürmez: sonuçta `decode_error` olur.
+    """
+    encoding = sniff_encoding(data)
+    extractors = None
+    if encoding in ASCII_COMPATIBLE:
+        started = time.perf_counter()
+        extractors = applicable(data)
+        if not extractors:
+            timings["lex"] = time.perf_counter() - started
+            timings["extract"] = 0.0
+            return empty_result()
+    code, problem = decode_source(data, encoding)
+    result = analyze_express_code(code, filename=name, time_budget=time_budget, timings=timings,
+                                  extractors=extractors)
+    if problem:
+        result["decode_error"] = problem
+    return result
+
+
+def _scan_file(task: Tuple[str, Optional[str]]):
+    """
+    Worker: tek dosyayı okuyup parse eder; hatayı dışarı taşımak yerine döndürür.
+    (dosya, sonuç, hata, digest, boyut, süreler) döner; süreler read / lex / extract.
+    İçerik hash'i `known_hash` ile aynıysa parse etmez, sonuç None döner.
+    Süre bütçesini aşan dosyada digest None ve hata "time" olur (bkz. SKIP_TIME).
+    """
+    file, known_hash = task
+    timings: Dict[str, float] = {}
+    size = 0
+    started = time.perf_counter()
+    try:
+        # büyük dosyalar mmap'lenir; hash ve ön filtre kopyasız çalışır
+        with open_source(file) as data:
+            size = len(data)
+            digest = content_hash(data)
+            timings["read"] = time.perf_counter() - started
+            if digest == known_hash:
+                return file, None, None, digest, size, timings
+            result = _analyze_raw(data, file, FILE_TIME_BUDGET, timings)
+        return file, result, None, digest, size, timings
+    except ParseBudgetExceeded:
+        return file, None, SKIP_TIME, None, size, timings
+    except Exception as e:
+        return file, None, f"{type(e).__name__}: {e}", None, size, timings
+
+
+def _scan_batch(tasks):
+    return [_scan_file(t) for t in tasks]
+
+
+class WorkerBudget:
+    """
+    Birden fazla eşzamanlı taramanın (ör. çok depolu toplu tarama) paylaştığı
+    tek process havuzu. Toplam worker sayısı ve havuzda bekleyen batch sayısı
+    (2 * workers) tarama sayısından bağımsızdır; küçük projeler de havuzu
+    kullanır, böylece çekirdekler depolar arasında boş kalmaz.
+    """
+
+    def __init__(self, workers: Optional[int] = None):
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        self.slots = threading.Semaphore(2 * self.workers)
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _execute_shared(batches, budget: WorkerBudget, tasks_of):
+    """
+    _execute'un paylaşılan havuz sürümü. Slot alınamazsa önce kendi en eski
+    batch'i beklenir; yalnızca bekleyen batch'i olmayan tarama slot için bloklanır,
+    böylece slotları tutan taramalar her zaman ilerleyebilir (kilitlenme olmaz).
+    """
+    pending = deque()
+    try:
+        for batch in batches:
+            while not budget.slots.acquire(blocking=not pending):
+                done_batch, fut = pending.popleft()
+                try:
+                    yield done_batch, fut.result()
+                finally:
+                    budget.slots.release()
+            pending.append((batch, budget.pool.submit(_scan_batch, tasks_of(batch))))
+        while pending:
+            done_batch, fut = pending.popleft()
+            try:
+                yield done_batch, fut.result()
+            finally:
+                budget.slots.release()
+    finally:
+        # yarıda bırakılan tarama slotlarını geri verir
+        for _, fut in pending:
+            fut.cancel()
+            budget.slots.release()
+
+
+def _plan(files, cache: Optional[ParseCache], report: Optional[ScanReport]):
+    """
+    Her dosya için (file, stat, cache_sonucu) üretir. Cache'te güncel kaydı
+    olan dosyalar okunmaz; stat alınamayanlar rapora yazılıp atlanır.
+    """
+    for file in files:
+        if cache is None:
+            yield file, None, None
+            continue
+        try:
+            st = os.stat(file)
+        except OSError as e:
+            if report is not None:
+                report.add_error(file, f"{type(e).__name__}: {e}")
+            continue
+        yield file, st, cache.lookup(file, st)
+
+
+def _batches(items, size):
+    it = iter(items)
+    while True:
+        batch = list(islice(it, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _execute(batches, workers, cache, budget: Optional[WorkerBudget] = None):
+    """
+    Batch'leri (sırası korunarak) çalıştırır ve (batch, parse_sonuçları) üretir.
+    Havuzda aynı anda en fazla 2 * workers batch bekler; bellek sabit kalır.
+    `budget` verilirse kendi havuzu yerine paylaşılan havuz kullanılır.
+    """
+    def tasks_of(batch):
+        return [(file, cache.known_hash(file) if cache else None)
+                for file, st, hit in batch if hit is None]
+
+    if budget is not None:
+        yield from _execute_shared(batches, budget, tasks_of)
+        return
+
+    # küçük projelerde havuz açmamak için ilk batch'lere bak
+    head, n_files = [], 0
+    for batch in batches:
+        head.append(batch)
+        n_files += len(batch)
+        if n_files >= MIN_PARALLEL_FILES:
+            break
+    n_workers = workers if workers is not None else (os.cpu_count() or 1)
+
+    if n_files < MIN_PARALLEL_FILES or n_workers <= 1:
+        for batch in chain(head, batches):
+            yield batch, _scan_batch(tasks_of(batch))
+        return
+
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        pending = deque()
+        for batch in chain(head, batches):
+            pending.append((batch, pool.submit(_scan_batch, tasks_of(batch))))
+            if len(pending) >= 2 * n_workers:
+                batch, fut = pending.popleft()
+                yield batch, fut.result()
+        while pending:
+            batch, fut = pending.popleft()
+            yield batch, fut.result()
+
+
+def iter_project_results(path, workers=None, chunksize=DEFAULT_CHUNKSIZE, report=None, cache_path=None,
+                         progress=None, hybrid=False, profile=None, budget=None,
+                         **discover) -> Iterator[Tuple[str, Dict]]:
+    """
+    `path` altındaki .js dosyalarını tarayıp her dosya için (dosya, analiz_sonucu)
+    çiftini tarama sürerken üretir (bkz. analyze_express_code).
+
+    workers=None -> CPU sayısı kadar process; workers=1 -> aynı process'te sıralı tarama.
+    Sonuçlar her zaman dosya keşif sırasıyla gelir, worker sayısından bağımsızdır.
+    Hatalar `report` (ScanReport) verildiyse oraya yazılır.
+    `cache_path` verilirse yalnızca değişen dosyalar yeniden parse edilir.
+    `progress(n)` verilirse her dosyadan sonra işlenen dosya sayısıyla çağrılır.
+    hybrid=True ise regex'in emin olamadığı rota çağrıları AI parser ile
+    tamamlanır (bkz. authgraph.core.hybrid); cache'e regex sonucu yazılır.
+    `profile` (ScanProfile) verilirse aşama süreleri ve dosya başına ölçümler yazılır.
+    `budget` (WorkerBudget) verilirse `workers` yok sayılır, paylaşılan havuz kullanılır.
+    Diğer anahtar argümanlar (extensions, excludes, ignore, max_bytes, ...)
+    dosya keşfine (iter_js_files) aktarılır.
+    """
+    results = _iter_parsed(path, workers, chunksize, report, cache_path, progress, profile, budget, discover)
+    if hybrid:
+        # AI bağımlılıkları (requests) yalnızca hibrit modda yüklenir
+        from authgraph.core.hybrid import refine_results
+        results = refine_results(results, report=report, profile=profile)
+    return results
+
+
+def _iter_parsed(path, workers, chunksize, report, cache_path, progress, profile, budget, discover):
+    cache = ParseCache(cache_path) if cache_path else None
+    seen = [] if cache is not None else None
+    if report is not None:
+        discover.setdefault("on_skip", report.add_skipped)
+    files = iter_js_files(path, **discover)
+    if profile is not None:
+        files = profile.timed(files, "discover")
+    batches = _batches(_plan(files, cache, report), max(1, chunksize))
+
+    completed = False
+    done = 0
+    try:
+        for batch, parsed in _execute(batches, workers, cache, budget):
+            parsed = iter(parsed)
+            for file, st, hit in batch:
+                done += 1
+                if progress is not None:
+                    progress(done)
+                if report is not None:
+                    report.files += 1
+                if seen is not None:
+                    seen.append(file)
+                if hit is not None:
+                    if report is not None:
+                        report.cached += 1
+                        if hit.get("decode_error"):
+                            report.add_warning(file, hit["decode_error"])
+                    yield file, hit
+                    continue
+
+                _, result, error, digest, size, timings = next(parsed)
+                if profile is not None:
+                    profile.add_file(file, size, timings)
+                if error == SKIP_TIME:
+                    if report is not None:
+                        report.add_skipped(file, SKIP_TIME)
+                    continue
+                if error:
+                    if report is not None:
+                        report.add_error(file, error)
+                    continue
+                if result is None:
+                    # içerik aynı, sadece mtime değişmiş
+                    result = cache.cached_result(file)
+                    if report is not None:
+                        report.cached += 1
+                if report is not None and result.get("decode_error"):
+                    report.add_warning(file, result["decode_error"])
+                if cache is not None:
+                    cache.store(file, st, digest, result)
+                yield file, result
+        completed = True
+    finally:
+        if cache is not None:
+            if completed:
+                cache.prune(seen)
+            cache.save()
+
+
+def iter_project_routes(path, **options) -> Iterator[Dict]:
+    """
+    Rotaları tarama sürerken dosya dosya üretir (sabit bellek). Mount'lar yalnızca
+    dosya içinde çözülür; dosyalar arası çözümleme için analyze_project kullanılır.
+    """
+    for _, result in iter_project_results(path, **options):
+        yield from result["routes"]
+
+
+def analyze_project(path, workers=None, chunksize=DEFAULT_CHUNKSIZE, report=None, cache_path=None,
+                    progress=None, resolve=True, hybrid=False, profile=None, budget=None, **discover):
+    """
+    Projeyi tarayıp tüm rotaları liste olarak döndürür. resolve=True ise başka
+    dosyalarda require/import edilip mount edilen router'ların tam path'leri de
+    (iç içe mount zincirleriyle) çözülür; dosyalar yeniden okunmaz.
+    """
+    results = iter_project_results(path, workers=workers, chunksize=chunksize, report=report,
+                                   cache_path=cache_path, progress=progress, hybrid=hybrid,
+                                   profile=profile, budget=budget, **discover)
+    if resolve:
+        results = list(results)
+        if profile is None:
+            return resolve_mounts(results)
+        with profile.stage("resolve"):
+            return resolve_mounts(results)
+    return [route for _, result in results for route in result["routes"]]
+
+
+def analyze_sources(sources, report=None, progress=None, resolve=True, hybrid=False,
+                    max_bytes=DEFAULT_MAX_BYTES, time_budget=FILE_TIME_BUDGET, profile=None):
+    """
+    Diskte olmayan kaynakları tarar: `sources` (isim, bytes) çiftleri üretir
+    (ör. arşiv üyeleri ya da bellekteki yüklemeler). Sıralı ve tek process'te çalışır.
+    hybrid=True ise belirsiz rota çağrıları AI parser ile tamamlanır.
+    `max_bytes` / `time_budget` sınırlarını aşan kaynaklar atlanıp rapora yazılır.
+    `profile` (ScanProfile) verilirse kaynak okuma "read" aşamasına, parse lex / extract'e yazılır.
+    """
+    if hybrid:
+        from authgraph.core.hybrid import refine_result
+    if profile is not None:
+        # arşiv üyelerinin açılması kaynak üretilirken olur
+        sources = profile.timed(sources, "read")
+    results = []
+    for done, (name, data) in enumerate(sources, 1):
+        if progress is not None:
+            progress(done)
+        if report is not None:
+            report.files += 1
+        if max_bytes is not None and len(data) > max_bytes:
+            if report is not None:
+                report.add_skipped(name, "size")
+            continue
+        timings: Dict[str, float] = {}
         try:
-            with open(file, "r", encoding="utf-8") as f:
-                content = f.read()
-            all_routes.extend(parse_express_code(content, filename=file))
+            result = _analyze_raw(data, name, time_budget, timings)
+        except ParseBudgetExceeded:
+            if report is not None:
+                report.add_skipped(name, SKIP_TIME)
+            continue
         except Exception as e:
-            # İstersen logla
-            pass
-    return all_routes
+            if report is not None:
+                report.add_error(name, f"{type(e).__name__}: {e}")
+            continue
+        finally:
+            if profile is not None:
+                profile.add_file(name, len(data), timings)
+        if report is not None and result.get("decode_error"):
+            report.add_warning(name, result["decode_error"])
+        if hybrid and result["uncertain"]:
+            started = time.perf_counter()
+            try:
+                result = refine_result(result, decode_source(data)[0], name)
+            except Exception as e:
+                if report is not None:
+                    report.add_error(name, f"AI: {type(e).__name__}: {e}")
+            if profile is not None:
+                profile.add_time("ai", time.perf_counter() - started)
+            if report is not None:
+                report.ai_files += 1
+        results.append((name, result))
+    if resolve:
+        if profile is None:
+            return resolve_mounts(results)
+        with profile.stage("resolve"):
+            return resolve_mounts(results)
+    return [route for _, result in results for route in result["routes"]]
@@ -0,0 +1,193 @@
+import hashlib
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterable, List, Optional
+
+from authgraph.core.analyzer import ScanReport, WorkerBudget, analyze_project
+from authgraph.exporter.csv_exporter import export_to_csv_stream
+
+INDEX_JOURNAL = "index.jsonl"
+INDEX_FILE = "index.json"
+SHARD_DIR = "shards"
+CACHE_DIR = "cache"
+
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+# Günlüğün son satırı bu işaretse önceki çalıştırma bitmiştir; devam edilecek bir şey yoktur
+RUN_COMPLETE = "complete"
+
+
+def read_manifest(path: str) -> List[str]:
+    """
+    Manifest: satır başına bir depo kökü; boş satırlar ve '#' yorumları atlanır.
+    Göreli yollar manifest dosyasının klasörüne göre çözülür. Tekrarlar bir kez sayılır.
+    """
+    base = os.path.dirname(os.path.abspath(path))
+    roots = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if line:
+                roots.append(os.path.normpath(os.path.join(base, os.path.expanduser(line))))
+    return list(dict.fromkeys(roots))
+
+
+def shard_name(root: str) -> str:
+    """Depo için kararlı shard adı: okunur isim + tam yolun kısa hash'i (aynı isimli depolar çakışmaz)."""
+    name = re.sub(r"[^A-Za-z0-9_.-]+", "_", os.path.basename(root.rstrip(os.sep)) or "root")
+    digest = hashlib.sha1(root.encode("utf-8")).hexdigest()[:8]
+    return f"{name}-{digest}"
+
+
+def load_journal(out_dir: str) -> Dict[str, Dict]:
+    """
+    Yarım kalan çalıştırmanın depo kayıtları (depo -> son kayıt). Tamamlanmış
+    bir çalıştırmanın sonundaki RUN_COMPLETE işaretinden önceki satırlar
+    sayılmaz; o durumda boş döner ve yeni çalıştırma her depoyu yeniden tarar.
+    Yarım kalan son satır atlanır.
+    """
+    entries: Dict[str, Dict] = {}
+    try:
+        with open(os.path.join(out_dir, INDEX_JOURNAL), "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue   # kesinti anında yarım yazılmış satır
+                if entry.get("run") == RUN_COMPLETE:
+                    entries = {}
+                elif "repo" in entry:
+                    entries[entry["repo"]] = entry
+    except OSError:
+        pass
+    return entries
+
+
+class BatchScanner:
+    """
+    Çok depolu toplu tarama. Tüm depolar tek bir WorkerBudget (process havuzu)
+    paylaşır; aynı anda `concurrency` depo taranır ama parse işi toplamda
+    `workers` çekirdeği aşmaz. Böylece süre depo sayısına değil toplam koda ve
+    çekirdek sayısına bağlıdır; küçük depolar da havuzu doldurur.
+
+    Çıktılar:
+      out_dir/shards/<depo>-<hash>.<ext> : depo başına rota dosyası (mount'lar çözülmüş)
+      out_dir/index.jsonl               : biten her depo için bir satır (devam günlüğü)
+      out_dir/index.json                : manifest sırasıyla tüm depolar ve toplamlar
+
+    Shard'lar atomik yazılır ve günlüğe ancak ondan sonra eklenir; kesintiden
+    sonra aynı out_dir ile çalıştırıldığında günlükte "done" olan ve aynı
+    biçimdeki shard'ı duran depolar atlanır (resume=False ise hepsi yeniden
+    taranır). Çalıştırma bitince günlüğe RUN_COMPLETE işareti yazılır; aynı
+    komut sonraki gece yeniden çalıştırıldığında taze bir günlükle tüm depolar
+    taranır. cache=True ise depo başına parse cache'i out_dir/cache altında
+    tutulur, böylece yalnızca değişen dosyalar parse edilir.
+    """
+
+    def __init__(self, out_dir: str, export: Callable = export_to_csv_stream, ext: str = ".csv",
+                 workers: Optional[int] = None, concurrency: Optional[int] = None, resume: bool = True,
+                 cache: bool = True, on_repo: Optional[Callable[[Dict], None]] = None, **discover):
+        self.out_dir = out_dir
+        self.export = export
+        self.ext = ext
+        self.workers = workers
+        self.concurrency = concurrency
+        self.resume = resume
+        self.cache = cache
+        self.on_repo = on_repo
+        self.discover = discover
+
+    def _scan_repo(self, root: str, budget: WorkerBudget) -> Dict:
+        started = time.perf_counter()
+        name = shard_name(root)
+        shard = os.path.join(SHARD_DIR, name + self.ext)
+        entry = {"repo": root, "shard": shard}
+        if not os.path.isdir(root):
+            entry.update(status=STATUS_FAILED, error="klasör bulunamadı")
+            return entry
+        report = ScanReport()
+        cache_path = os.path.join(self.out_dir, CACHE_DIR, name + ".json") if self.cache else None
+        try:
+            routes = analyze_project(root, report=report, cache_path=cache_path, budget=budget, **self.discover)
+            target = os.path.join(self.out_dir, shard)
+            tmp = os.path.join(self.out_dir, SHARD_DIR, f"{name}.tmp{self.ext}")
+            count = self.export(routes, tmp)
+            os.replace(tmp, target)   # günlükteki her shard tam yazılmıştır
+        except Exception as e:
+            entry.update(status=STATUS_FAILED, error=f"{type(e).__name__}: {e}")
+            return entry
+        entry.update(status=STATUS_DONE, routes=count, files=report.files, cached=report.cached,
+                     errors=len(report.errors), skipped=len(report.skipped),
+                     seconds=round(time.perf_counter() - started, 3))
+        return entry
+
+    def _pending(self, roots: List[str], journal: Dict[str, Dict]) -> List[str]:
+        if not self.resume:
+            return roots
+        todo = []
+        for root in roots:
+            entry = journal.get(root)
+            done = (entry is not None and entry.get("status") == STATUS_DONE
+                    and entry["shard"].endswith(self.ext)
+                    and os.path.exists(os.path.join(self.out_dir, entry["shard"])))
+            if not done:
+                todo.append(root)
+        return todo
+
+    def run(self, roots: Iterable[str]) -> Dict:
+        """Depoları tarar ve index.json içeriğini döndürür."""
+        roots = list(roots)
+        os.makedirs(os.path.join(self.out_dir, SHARD_DIR), exist_ok=True)
+        journal_path = os.path.join(self.out_dir, INDEX_JOURNAL)
+        journal = load_journal(self.out_dir) if self.resume else {}
+        todo = self._pending(roots, journal)
+
+        # devam edilecek yarım çalıştırma yoksa günlük baştan başlar
+        mode = "a" if journal else "w"
+        with WorkerBudget(self.workers) as budget, open(journal_path, mode, encoding="utf-8") as log:
+            concurrency = self.concurrency or budget.workers
+            with ThreadPoolExecutor(max_workers=max(1, concurrency)) as threads:
+                futures = [threads.submit(self._scan_repo, root, budget) for root in todo]
+                try:
+                    for fut in as_completed(futures):
+                        entry = fut.result()
+                        journal[entry["repo"]] = entry
+                        log.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                        log.flush()
+                        os.fsync(log.fileno())
+                        if self.on_repo is not None:
+                            self.on_repo(entry)
+                except BaseException:
+                    # Ctrl+C: başlamamış depolar iptal; günlükteki depolar bir sonraki çalıştırmada atlanır
+                    for f in futures:
+                        f.cancel()
+                    raise
+            log.write(json.dumps({"run": RUN_COMPLETE}) + "\n")
+            log.flush()
+            os.fsync(log.fileno())
+        return self.write_index(roots, journal)
+
+    def write_index(self, roots: List[str], journal: Dict[str, Dict]) -> Dict:
+        repos = [journal.get(root) or {"repo": root, "status": "pending"} for root in roots]
+        done = [r for r in repos if r.get("status") == STATUS_DONE]
+        index = {
+            "repos": repos,
+            "totals": {
+                "repos": len(repos),
+                "done": len(done),
+                "failed": sum(1 for r in repos if r.get("status") == STATUS_FAILED),
+                "routes": sum(r.get("routes", 0) for r in done),
+                "files": sum(r.get("files", 0) for r in done),
+            },
+        }
+        path = os.path.join(self.out_dir, INDEX_FILE)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, path)
+        return index
+
@@ -0,0 +1,97 @@
+import hashlib
+import json
+import os
+from typing import Dict, Iterable, Optional
+
+from authgraph.models.permission import RouteRecord
+from authgraph.scanner.extractors import fingerprint
+
+CACHE_VERSION = 9
+
+
+def cache_version() -> str:
+    """Biçim sürümü + yetki yapılandırması / extractor kümesi özeti (bkz. extractors.fingerprint)."""
+    return f"{CACHE_VERSION}-{fingerprint()}"
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _encode(result: Dict) -> Dict:
+    # Rotalar dict yerine ROUTE_FIELDS sıralı listeler olarak saklanır
+    return dict(result, routes=[r.to_row() for r in result["routes"]])
+
+
+def _decode(stored: Dict) -> Dict:
+    return dict(stored, routes=[RouteRecord.from_row(row) for row in stored["routes"]])
+
+
+class ParseCache:
+    """
+    Dosya başına parse sonuçlarının diskte tutulduğu cache.
+
+    Anahtar dosya yoludur; her kayıt mtime, boyut ve içerik hash'i ile
+    birlikte saklanır. mtime/boyut tutuyorsa dosya hiç okunmaz; tutmuyor ama
+    hash aynıysa (ör. `touch`, checkout) yeniden parse edilmez. Sürüm yetki
+    yapılandırmasını da kapsar; yapılandırma değişirse cache baştan kurulur.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.version = cache_version()
+        self.entries: Dict[str, Dict] = {}
+        self.dirty = False
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get("version") == self.version:
+            self.entries = data.get("files") or {}
+
+    def lookup(self, file: str, st: os.stat_result) -> Optional[Dict]:
+        """mtime ve boyut değişmemişse saklanan analiz sonucunu döndürür."""
+        entry = self.entries.get(file)
+        if entry and entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size:
+            return _decode(entry["result"])
+        return None
+
+    def known_hash(self, file: str) -> Optional[str]:
+        entry = self.entries.get(file)
+        return entry["hash"] if entry else None
+
+    def cached_result(self, file: str) -> Optional[Dict]:
+        entry = self.entries.get(file)
+        return _decode(entry["result"]) if entry else None
+
+    def store(self, file: str, st: os.stat_result, digest: str, result: Dict):
+        self.entries[file] = {
+            "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size,
+            "hash": digest,
+            "result": _encode(result),
+        }
+        self.dirty = True
+
+    def prune(self, live_files: Iterable[str]):
+        """Artık projede olmayan dosyaların kayıtlarını siler."""
+        live = set(live_files)
+        for file in [f for f in self.entries if f not in live]:
+            del self.entries[file]
+            self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": self.version, "files": self.entries}, f, separators=(",", ":"))
+        os.replace(tmp, self.path)
+        self.dirty = False
@@ -0,0 +1,138 @@
+import re
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from authgraph.models.permission import RouteRecord
+from authgraph.scanner.ai_parser import MAX_CONCURRENCY, parse_express_code_ai
+from authgraph.scanner.source_reader import decode_source, open_source
+
+# Belirsiz bölgenin bitişi bilinmiyorsa (kapanmamış çağrı) gönderilecek satır sayısı
+UNCLOSED_LINES = 30
+
+# Bu türlerde regex'in path'i güvenilmez; AI'ın path'i kullanılır
+PATH_KINDS = frozenset(("dynamic_path", "unclosed"))
+
+# AI'a bağlam olarak her zaman gönderilen satırlar: string sabitleri, require/import,
+# express() / Router() tanımları ve mount'lar
+RE_CONTEXT_LINE = re.compile(
+    r'^\s*(?:(?:export\s+)?(?:const|let|var)\s+[\w$]+\s*=\s*(?:["\'`]|require\s*\(|express\b)'
+    r'|import\b|[\w$.]+\.use\s*\()'
+)
+
+
+def _region_ranges(uncertain: List) -> List[Tuple[int, int, str]]:
+    return [(start, end if end is not None else start + UNCLOSED_LINES, kind) for start, end, kind in uncertain]
+
+
+def sparse_code(js_code: str, uncertain: List) -> str:
+    """
+    AI'a gidecek kod: yalnızca belirsiz rota çağrıları ve bağlam satırları kalır,
+    diğer satırlar boşaltılır. Satır sayısı korunduğu için AI'ın verdiği satır
+    numaraları dosyadakiyle aynıdır.
+    """
+    lines = js_code.split("\n")
+    keep = bytearray(len(lines))
+    for start, end, _ in _region_ranges(uncertain):
+        keep[start - 1:min(end, len(lines))] = b"\1" * (min(end, len(lines)) - start + 1)
+    out = [line if keep[i] or RE_CONTEXT_LINE.match(line) else "" for i, line in enumerate(lines)]
+    while out and not out[-1]:
+        out.pop()
+    return "\n".join(out)
+
+
+def merge_routes(routes: List[RouteRecord], records: List[Dict], uncertain: List,
+                 filename: str) -> List[RouteRecord]:
+    """
+    AI kayıtlarını regex rotalarıyla birleştirir. Yalnızca belirsiz bölgelere
+    düşen AI kayıtları kabul edilir (bağlam satırlarından türetilenler atılır).
+    Aynı satır + metottaki regex rotasının rolleri AI'ınkilerle birleştirilir;
+    path yalnızca dinamik / kapanmamış çağrılarda AI'dan alınır. Eşi olmayan
+    AI kaydı, aynı bölgede aynı metot + path'li bir kayıt yoksa eklenir;
+    regex kayıtları birbirleriyle hiç birleştirilmez (farklı router'ların
+    mount öncesi aynı path'i olabilir).
+    """
+    ranges = _region_ranges(uncertain)
+    by_key = {}
+    for i, route in enumerate(routes):
+        by_key.setdefault((route.line, route.method), []).append(i)
+    merged = list(routes)
+    for rec in records:
+        region = next(((start, end, k) for start, end, k in ranges if start - 1 <= rec["line"] <= end + 1), None)
+        if region is None or not rec["path"]:
+            continue
+        start, end, kind = region
+        hits = by_key.get((rec["line"], rec["method"]))
+        if not hits:
+            duplicate = any(r.method == rec["method"] and r.path == rec["path"] and start - 1 <= r.line <= end + 1
+                            for r in merged)
+            if not duplicate:
+                merged.append(RouteRecord(filename, rec["line"], rec["source"], rec["method"], rec["path"],
+                                          rec["roles"]))
+            continue
+        for i in hits:
+            old = merged[i]
+            roles = list(dict.fromkeys(list(old.roles) + rec["roles"]))
+            path = rec["path"] if kind in PATH_KINDS else old.path
+            merged[i] = RouteRecord(old.file, old.line, old.source, old.method, path, roles,
+                                    column=old.column, end_line=old.end_line, end_column=old.end_column)
+    return merged
+
+
+def refine_result(result: Dict, js_code: str, filename: str, **ai_options) -> Dict:
+    """
+    analyze_express_code sonucunu, belirsiz bölgeler varsa AI parser ile
+    tamamlar. Belirsiz bölgesi olmayan dosya için model çağrılmaz.
+    """
+    uncertain = result.get("uncertain") or []
+    if not uncertain:
+        return result
+    records = parse_express_code_ai(sparse_code(js_code, uncertain), filename, **ai_options)
+    return dict(result, routes=merge_routes(result["routes"], records, uncertain, filename))
+
+
+def _read_file(file: str) -> str:
+    with open_source(file) as data:
+        return decode_source(data)[0]
+
+
+def refine_results(results: Iterable[Tuple[str, Dict]], read: Callable[[str], str] = _read_file,
+                   workers: int = MAX_CONCURRENCY, report=None, profile=None,
+                   **ai_options) -> Iterator[Tuple[str, Dict]]:
+    """
+    (dosya, analiz_sonucu) akışındaki belirsiz dosyaları AI ile tamamlar; sıra korunur.
+    Yalnızca belirsiz bölgesi olan dosyalar yeniden okunur ve en fazla `workers`
+    dosya aynı anda modele gider. AI hatası dosyanın regex sonucunu bozmaz,
+    `report` verildiyse oraya yazılır. `profile` verilirse yalnızca AI
+    işinin (yeniden okuma + model çağrısı) süresi "ai" aşamasına eklenir;
+    akışı besleyen tarama bu süreye girmez.
+    """
+    def work(file: str, result: Dict) -> Tuple[Dict, Optional[str], float]:
+        started = time.perf_counter()
+        try:
+            return refine_result(result, read(file), file, **ai_options), None, time.perf_counter() - started
+        except Exception as e:
+            return result, f"{type(e).__name__}: {e}", time.perf_counter() - started
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        pending = deque()
+
+        def drain(limit):
+            while len(pending) > limit:
+                file, result, fut = pending.popleft()
+                if fut is not None:
+                    result, error, seconds = fut.result()
+                    if profile is not None:
+                        profile.add_time("ai", seconds)
+                    if report is not None:
+                        report.ai_files += 1
+                        if error:
+                            report.add_error(file, f"AI: {error}")
+                yield file, result
+
+        for file, result in results:
+            fut = pool.submit(work, file, result) if result.get("uncertain") else None
+            pending.append((file, result, fut))
+            yield from drain(2 * max(1, workers))
+        yield from drain(0)
@@ -0,0 +1,123 @@
+from typing import Dict, Iterable, List, Optional, Set
+
+
+def _segments(path: str) -> List[str]:
+    return [s for s in (path or "").split("/") if s]
+
+
+class _TrieNode:
+    __slots__ = ("children", "wild", "routes")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.wild: List["_TrieNode"] = []    # ":param" / "*" çocukları
+        self.routes: List[int] = []
+
+
+class AuthIndex:
+    """
+    analyze_project çıktısı üzerinde bellek içi yetki indeksi.
+
+    - rol -> rotalar (rolü olmayan rotalar `None` anahtarı altında)
+    - path segment trie'si: prefix ("/admin/*") ve tam path sorguları
+
+    Sorgular graph veritabanına gitmez; tipik bir sorgu mikro saniyeler sürer.
+    """
+
+    def __init__(self, routes: Iterable = ()):
+        self.routes: List = []
+        self.by_role: Dict[Optional[str], List[int]] = {}
+        self._root = _TrieNode()
+        for route in routes:
+            self.add(route)
+
+    def __len__(self):
+        return len(self.routes)
+
+    def add(self, route):
+        idx = len(self.routes)
+        self.routes.append(route)
+        for role in route.get("roles") or [None]:
+            self.by_role.setdefault(role, []).append(idx)
+        node = self._root
+        for seg in _segments(route.get("path")):
+            child = node.children.get(seg)
+            if child is None:
+                child = node.children[seg] = _TrieNode()
+                if seg.startswith(":") or seg == "*":
+                    node.wild.append(child)
+            node = child
+        node.routes.append(idx)
+
+    def _node(self, path: str) -> Optional[_TrieNode]:
+        node = self._root
+        for seg in _segments(path):
+            node = node.children.get(seg)
+            if node is None:
+                return None
+        return node
+
+    def _subtree(self, node: _TrieNode) -> List[int]:
+        out, stack = [], [node]
+        while stack:
+            n = stack.pop()
+            out.extend(n.routes)
+            stack.extend(n.children.values())
+        return sorted(out)
+
+    # --- Sorgular ---
+    def roles(self) -> List[str]:
+        return sorted(r for r in self.by_role if r is not None)
+
+    def routes_for_role(self, role: Optional[str], method: Optional[str] = None) -> List:
+        """`role` rolünün erişebildiği rotalar; role=None -> rol kontrolü olmayanlar."""
+        hits = (self.routes[i] for i in self.by_role.get(role, ()))
+        if method:
+            method = method.upper()
+            return [r for r in hits if r.get("method") == method]
+        return list(hits)
+
+    def routes_under(self, pattern: str) -> List:
+        """
+        "/admin/*" -> /admin altındaki tüm rotalar (/admin dahil),
+        "/admin"   -> yalnızca tam olarak /admin tanımlı rotalar.
+        """
+        prefix = pattern.endswith("*")
+        node = self._node(pattern.rstrip("*"))
+        if node is None:
+            return []
+        ids = self._subtree(node) if prefix else node.routes
+        return [self.routes[i] for i in ids]
+
+    def roles_for_path(self, pattern: str) -> Set[Optional[str]]:
+        """Verilen path'e / prefix'e erişebilen roller (None: rolsüz erişim var)."""
+        out = set()
+        for route in self.routes_under(pattern):
+            out.update(route.get("roles") or [None])
+        return out
+
+    def match(self, path: str, method: Optional[str] = None) -> List:
+        """
+        Somut bir isteği ("/users/42") tanımlı rotalarla eşleştirir;
+        ":param" ve "*" segmentleri her değeri karşılar.
+        """
+        nodes = [self._root]
+        for seg in _segments(path):
+            nxt = []
+            for n in nodes:
+                child = n.children.get(seg)
+                if child is not None:
+                    nxt.append(child)
+                nxt.extend(c for c in n.wild if c is not child)
+            nodes = nxt
+            if not nodes:
+                return []
+        ids = sorted(i for n in nodes for i in n.routes)
+        hits = [self.routes[i] for i in ids]
+        if method:
+            method = method.upper()
+            hits = [r for r in hits if r.get("method") in (method, "ALL")]
+        return hits
+
+    def can_access(self, role: Optional[str], path: str, method: Optional[str] = None) -> bool:
+        return any(role in (r.get("roles") or [None]) for r in self.match(path, method))
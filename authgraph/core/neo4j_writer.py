@@ -1,15 +1,265 @@
+import json
+import os
+import time
+from itertools import islice
+from typing import Dict, Optional
 
-from py2neo import Graph, Node, Relationship
+NEO4J_BOLT = os.getenv("NEO4J_BOLT", "bolt://localhost:7688")
+NEO4J_USER = os.getenv("NEO4J_USER", "neo4j")
+NEO4J_PASS = os.getenv("NEO4J_PASS", "test1234")
+DEFAULT_BATCH_SIZE = 1000
 
-def push_to_neo4j(routes):
-    graph = Graph("bolt://localhost:7688", auth=("neo4j", "test1234"))
-    graph.run("MATCH (n) DETACH DELETE n")
+SCHEMA = [
+    "CREATE CONSTRAINT role_name IF NOT EXISTS FOR (r:Role) REQUIRE r.name IS UNIQUE",
+    "CREATE CONSTRAINT path_url IF NOT EXISTS FOR (p:Path) REQUIRE p.url IS UNIQUE",
+    "CREATE CONSTRAINT method_type IF NOT EXISTS FOR (m:Method) REQUIRE m.type IS UNIQUE",
+]
+
+# Tüm veritabanını tek transaction'da silmek büyük graph'larda belleği patlatır
+WIPE_QUERY = "MATCH (n) WITH n LIMIT 10000 DETACH DELETE n RETURN count(*)"
+
+# Rolü olmayan rotalar için Role düğümü / CAN_ACCESS oluşturulmaz
+UPSERT_ROUTES = """
+UNWIND $rows AS row
+MERGE (p:Path {url: row.path})
+MERGE (m:Method {type: row.method})
+MERGE (p)-[a:ALLOWS]->(m)
+SET a.file = row.file, a.line = row.line, a.column = row.column
+FOREACH (_ IN CASE WHEN row.role IS NULL THEN [] ELSE [1] END |
+    MERGE (r:Role {name: row.role})
+    MERGE (r)-[:CAN_ACCESS]->(p))
+"""
+
+_graphs = {}
+
+
+def get_graph(uri=NEO4J_BOLT, user=NEO4J_USER, password=NEO4J_PASS):
+    """Aynı bağlantı bilgileri için tek bir (connection pool'lu) Graph nesnesi döndürür."""
+    key = (uri, user, password)
+    graph = _graphs.get(key)
+    if graph is None:
+        from py2neo import Graph
+        graph = Graph(uri, auth=(user, password))
+        _graphs[key] = graph
+    return graph
+
+
+def ensure_schema(graph):
+    """
+    Constraint'leri (ve dolayısıyla index'leri) graph nesnesi başına bir kez
+    kurar. İşaret nesnenin üzerinde tutulur; id() ile tutulsaydı serbest
+    bırakılan graph'ın id'sini alan yeni bir nesne şemayı atlardı.
+    """
+    if getattr(graph, "_authgraph_schema_ready", False):
+        return
+    for query in SCHEMA:
+        graph.run(query)
+    graph._authgraph_schema_ready = True
+
+
+def wipe_graph(graph):
+    while graph.run(WIPE_QUERY).evaluate():
+        pass
+
+
+def _row(route) -> Dict:
+    return {
+        "role": route.get("role"),
+        "path": route.get("path") or "",
+        "method": route.get("method"),
+        "file": route.get("file"),
+        "line": route.get("line"),
+        "column": route.get("column"),
+    }
+
+
+def push_to_neo4j(routes, graph=None, batch_size=DEFAULT_BATCH_SIZE, wipe=True) -> Dict:
+    """
+    Rotaları `batch_size`'lık parçalar halinde UNWIND ile yazar; her parça
+    ayrı bir transaction'dır. `graph` verilmezse paylaşılan bağlantı kullanılır
+    (testlerde yerine sahte bir graph verilebilir).
+    Yazılan rota sayısını ve saniyedeki rota hızını döndürür.
+    """
+    graph = graph if graph is not None else get_graph()
+    started = time.perf_counter()
+
+    ensure_schema(graph)
+    if wipe:
+        wipe_graph(graph)
+
+    total = batches = 0
+    it = iter(routes)
+    while True:
+        rows = [_row(r) for r in islice(it, max(1, batch_size))]
+        if not rows:
+            break
+        tx = graph.begin()
+        tx.run(UPSERT_ROUTES, rows=rows)
+        graph.commit(tx)
+        total += len(rows)
+        batches += 1
+
+    seconds = time.perf_counter() - started
+    return {
+        "routes": total,
+        "batches": batches,
+        "seconds": round(seconds, 3),
+        "routes_per_sec": round(total / seconds, 1) if seconds > 0 else 0.0,
+    }
+
+
+# --- Fark (diff) tabanlı senkronizasyon ---
+
+NODE_LABELS = {"roles": ("Role", "name"), "paths": ("Path", "url"), "methods": ("Method", "type")}
+
+REMOVE_CAN_ACCESS = """
+UNWIND $rows AS row
+MATCH (:Role {name: row[0]})-[e:CAN_ACCESS]->(:Path {url: row[1]})
+DELETE e
+"""
+
+REMOVE_ALLOWS = """
+UNWIND $rows AS row
+MATCH (:Path {url: row[0]})-[e:ALLOWS]->(:Method {type: row[1]})
+DELETE e
+"""
+
+ADD_CAN_ACCESS = """
+UNWIND $rows AS row
+MERGE (r:Role {name: row[0]})
+MERGE (p:Path {url: row[1]})
+MERGE (r)-[:CAN_ACCESS]->(p)
+"""
+
+ADD_ALLOWS = """
+UNWIND $rows AS row
+MERGE (p:Path {url: row[0]})
+MERGE (m:Method {type: row[1]})
+MERGE (p)-[a:ALLOWS]->(m)
+SET a.file = row[2], a.line = row[3], a.column = row[4]
+"""
+
+
+def graph_snapshot(routes) -> Dict:
+    """
+    Rotalardan graph'ın düğüm ve kenar kümelerini çıkarır. ALLOWS kenarları
+    kaynak konumlarıyla birlikte tutulur; konum değişirse kenar güncellenir.
+    """
+    roles, paths, methods, can_access, allows = set(), set(), set(), set(), {}
     for route in routes:
-        role = Node("Role", name=route["role"])
-        path = Node("Path", url=route["path"])
-        method = Node("Method", type=route["method"])
-        graph.merge(role, "Role", "name")
-        graph.merge(path, "Path", "url")
-        graph.merge(method, "Method", "type")
-        graph.merge(Relationship(role, "CAN_ACCESS", path))
-        graph.merge(Relationship(path, "ALLOWS", method))
\ No newline at end of file
+        if hasattr(route, "to_row"):
+            # RouteRecord: alan alan Mapping.get'ten kaçınılır (izleme modunda her güncellemede çalışır)
+            file, line, column, _, _, _, method, path, role, _ = route.to_row()
+            path = path or ""
+        else:
+            row = _row(route)
+            file, line, column, method, path, role = (row["file"], row["line"], row["column"],
+                                                      row["method"], row["path"], row["role"])
+        paths.add(path)
+        methods.add(method)
+        allows[(path, method)] = (file, line, column)
+        if role is not None:
+            roles.add(role)
+            can_access.add((role, path))
+    return {"roles": roles, "paths": paths, "methods": methods, "can_access": can_access, "allows": allows}
+
+
+def load_snapshot(path) -> Optional[Dict]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return {
+        "roles": set(data["roles"]),
+        "paths": set(data["paths"]),
+        "methods": set(data["methods"]),
+        "can_access": {tuple(e) for e in data["can_access"]},
+        "allows": {(e[0], e[1]): tuple(e[2:]) for e in data["allows"]},
+    }
+
+
+def save_snapshot(path, snap: Dict):
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    data = {
+        "roles": sorted(snap["roles"]),
+        "paths": sorted(snap["paths"]),
+        "methods": sorted(snap["methods"]),
+        "can_access": sorted(snap["can_access"]),
+        "allows": [list(k) + list(v) for k, v in snap["allows"].items()],
+    }
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        # json.dumps C encoder'ı kullanır; json.dump saf Python'da parça parça yazar
+        f.write(json.dumps(data))
+    os.replace(tmp, path)
+
+
+def diff_snapshots(old: Dict, new: Dict) -> Dict:
+    """İki snapshot arasındaki eklenen / silinen düğüm ve kenarlar."""
+    delta = {}
+    for key in NODE_LABELS:
+        delta["add_" + key] = new[key] - old[key]
+        delta["remove_" + key] = old[key] - new[key]
+    delta["add_can_access"] = new["can_access"] - old["can_access"]
+    delta["remove_can_access"] = old["can_access"] - new["can_access"]
+    delta["add_allows"] = [k + v for k, v in new["allows"].items() if old["allows"].get(k) != v]
+    delta["remove_allows"] = [k for k in old["allows"] if k not in new["allows"]]
+    return delta
+
+
+def _run_batched(graph, query, items, batch_size):
+    it = iter(items)
+    while True:
+        rows = [list(x) if isinstance(x, tuple) else x for x in islice(it, max(1, batch_size))]
+        if not rows:
+            return
+        tx = graph.begin()
+        tx.run(query, rows=rows)
+        graph.commit(tx)
+
+
+def sync_to_neo4j(routes, snapshot_path, graph=None, batch_size=DEFAULT_BATCH_SIZE) -> Dict:
+    """
+    Graph'ı silip yeniden kurmak yerine son snapshot'a göre yalnızca farkı uygular.
+    Snapshot yoksa (ilk çalıştırma) graph temizlenip tamamı yüklenir.
+    Uygulanan ekleme/silme sayılarını döndürür.
+    """
+    graph = graph if graph is not None else get_graph()
+    started = time.perf_counter()
+    ensure_schema(graph)
+
+    new = graph_snapshot(routes)
+    old = load_snapshot(snapshot_path)
+    if old is None:
+        wipe_graph(graph)
+        old = graph_snapshot([])
+    stats = apply_snapshot_diff(graph, old, new, batch_size)
+    save_snapshot(snapshot_path, new)
+    stats["seconds"] = round(time.perf_counter() - started, 3)
+    return stats
+
+
+def apply_snapshot_diff(graph, old: Dict, new: Dict, batch_size=DEFAULT_BATCH_SIZE) -> Dict:
+    """
+    `old` snapshot'ındaki graph'ı `new`e getirir; uygulanan ekleme/silme sayılarını
+    döndürür. Önceki snapshot'ı bellekte tutan çağıranlar (ör. izleme modu) diske
+    gidip gelmeden doğrudan kullanır.
+    """
+    ensure_schema(graph)
+    delta = diff_snapshots(old, new)
+
+    # Önce kenarlar, sonra artık kullanılmayan düğümler silinir
+    _run_batched(graph, REMOVE_CAN_ACCESS, delta["remove_can_access"], batch_size)
+    _run_batched(graph, REMOVE_ALLOWS, delta["remove_allows"], batch_size)
+    for key, (label, prop) in NODE_LABELS.items():
+        query = f"UNWIND $rows AS value MATCH (n:{label} {{{prop}: value}}) DETACH DELETE n"
+        _run_batched(graph, query, delta["remove_" + key], batch_size)
+    for key, (label, prop) in NODE_LABELS.items():
+        query = f"UNWIND $rows AS value MERGE (:{label} {{{prop}: value}})"
+        _run_batched(graph, query, delta["add_" + key], batch_size)
+    _run_batched(graph, ADD_CAN_ACCESS, delta["add_can_access"], batch_size)
+    _run_batched(graph, ADD_ALLOWS, delta["add_allows"], batch_size)
+    return {k: len(v) for k, v in delta.items()}
@@ -0,0 +1,129 @@
+import cProfile
+import heapq
+import io
+import pstats
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional
+
+DEFAULT_SLOWEST = 10
+
+
+class ScanProfile:
+    """
+    Bir taramanın aşama süreleri ve dosya başına parse süre / boyut ölçümleri.
+
+    Aşamalar (saniye, toplam):
+      discover  : klasör gezintisi (iter_js_files içinde geçen süre)
+      read      : dosya okuma + hash (worker'larda, CPU toplamı)
+      lex       : token / çağrı taraması (scan_calls)
+      extract   : sembol, path ve rol çıkarımı
+      resolve   : dosyalar arası mount çözümlemesi
+      export / neo4j : çağıran tarafından stage() ile ölçülür
+    Paralel taramada read / lex / extract worker sürelerinin toplamıdır, duvar
+    saati değildir; `wall` tüm taramanın duvar saatidir.
+
+    Yalnızca en yavaş `slowest` dosya tutulur (heap), bellek dosya sayısından bağımsızdır.
+    cprofile=True ise ana process cProfile ile izlenir (worker process'ler hariç;
+    tam profil için workers=1 kullanın).
+    """
+
+    def __init__(self, slowest: int = DEFAULT_SLOWEST, cprofile: bool = False):
+        self.slowest = slowest
+        self.stages: Dict[str, float] = {}
+        self.files = 0
+        self.bytes = 0
+        self._heap: List = []
+        self._started = time.perf_counter()
+        self._finished: Optional[float] = None
+        self.profiler = cProfile.Profile() if cprofile else None
+        if self.profiler is not None:
+            self.profiler.enable()
+
+    def add_time(self, stage: str, seconds: float):
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    @contextmanager
+    def stage(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - started)
+
+    def timed(self, iterable: Iterable, name: str) -> Iterator:
+        """`iterable`ın her next() çağrısında geçen süreyi `name` aşamasına ekler."""
+        it = iter(iterable)
+        while True:
+            started = time.perf_counter()
+            try:
+                item = next(it)
+            except StopIteration:
+                self.add_time(name, time.perf_counter() - started)
+                return
+            self.add_time(name, time.perf_counter() - started)
+            yield item
+
+    def add_file(self, file: str, size: int, timings: Dict[str, float]):
+        """Worker'dan dönen dosya ölçümü: boyut ve aşama süreleri (read / lex / extract)."""
+        self.files += 1
+        self.bytes += size
+        for name, seconds in timings.items():
+            self.add_time(name, seconds)
+        parse = timings.get("lex", 0.0) + timings.get("extract", 0.0)
+        entry = (parse, file, size)
+        if len(self._heap) < self.slowest:
+            heapq.heappush(self._heap, entry)
+        elif self.slowest and parse > self._heap[0][0]:
+            heapq.heapreplace(self._heap, entry)
+
+    def finish(self):
+        if self._finished is None:
+            self._finished = time.perf_counter()
+            if self.profiler is not None:
+                self.profiler.disable()
+
+    def cprofile_stats(self, limit: int = 30) -> List[Dict]:
+        """Kümülatif süreye göre en pahalı `limit` fonksiyon."""
+        if self.profiler is None:
+            return []
+        stats = pstats.Stats(self.profiler, stream=io.StringIO())
+        stats.sort_stats("cumulative")
+        rows = []
+        for func in stats.fcn_list[:limit]:
+            cc, nc, tt, ct, _ = stats.stats[func]
+            file, line, name = func
+            rows.append({"function": f"{file}:{line}({name})", "calls": nc,
+                         "tottime": round(tt, 4), "cumtime": round(ct, 4)})
+        return rows
+
+    def dump_cprofile(self, path: str):
+        """snakeviz / pstats ile açılabilen .prof dosyası yazar."""
+        if self.profiler is not None:
+            self.profiler.dump_stats(path)
+
+    def to_dict(self, report=None) -> Dict:
+        end = self._finished if self._finished is not None else time.perf_counter()
+        wall = end - self._started
+        out = {
+            "wall_seconds": round(wall, 4),
+            "files": self.files,
+            "bytes": self.bytes,
+            "mb_per_sec": round(self.bytes / 1e6 / wall, 2) if wall > 0 else None,
+            "stages": {name: round(seconds, 4) for name, seconds in sorted(self.stages.items())},
+            "slowest_files": [
+                {"file": file, "bytes": size, "parse_seconds": round(parse, 5)}
+                for parse, file, size in sorted(self._heap, reverse=True)
+            ],
+        }
+        if report is not None:
+            counts: Dict[str, int] = {}
+            for err in report.errors:
+                kind = err["error"].split(":", 1)[0]
+                counts[kind] = counts.get(kind, 0) + 1
+            out["errors"] = {"total": len(report.errors), "by_type": counts}
+            out["skipped"] = len(report.skipped)
+            out["warnings"] = len(report.warnings)
+        if self.profiler is not None:
+            out["cprofile"] = self.cprofile_stats()
+        return out
@@ -0,0 +1,154 @@
+import posixpath
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from authgraph.scanner.express_parser import _combine_paths
+
+# require('./x') için denenecek dosya sonekleri (Node çözümleme sırası)
+MODULE_SUFFIXES = ("", ".js", ".ts", ".mjs", ".cjs", "/index.js", "/index.ts", "/index.mjs", "/index.cjs")
+
+Node = Tuple[str, str]   # (dosya, değişken)
+
+
+def _norm(path: str) -> str:
+    return posixpath.normpath(path.replace("\\", "/"))
+
+
+class SymbolTable:
+    """
+    Proje genelinde router sembol tablosu (1. faz).
+
+    Her dosyanın analiz sonucundaki mount / import / export bilgisinden
+    (dosya, değişken) düğümleri arasında "şu base ile mount edilmiş" kenarları
+    kurar. Dosyalar yeniden okunmaz; kurulum toplam sembol sayısıyla doğrusaldır.
+    """
+
+    def __init__(self, results: Iterable[Tuple[str, Dict]]):
+        self.results: Dict[str, Dict] = {}
+        self.by_norm: Dict[str, str] = {}
+        for file, result in results:
+            self.results[file] = result
+            self.by_norm[_norm(file)] = file
+        # çocuk düğüm -> [(ebeveyn düğüm, base)]
+        self.parents: Dict[Node, List[Tuple[Node, str]]] = {}
+        for file, result in self.results.items():
+            self._index_file(file, result)
+
+    def resolve_module(self, importer: str, spec: str) -> Optional[str]:
+        if not spec.startswith("."):
+            return None   # paket (express vb.), proje dosyası değil
+        base = _norm(posixpath.join(posixpath.dirname(_norm(importer)), spec))
+        for suffix in MODULE_SUFFIXES:
+            file = self.by_norm.get(base + suffix)
+            if file is not None:
+                return file
+        return None
+
+    def _exported_router(self, file: str) -> Optional[str]:
+        result = self.results[file]
+        exports = result.get("exports") or []
+        routers = set(result.get("router_vars") or [])
+        for name in exports:
+            if name in routers:
+                return name
+        return exports[0] if exports else None
+
+    def _index_file(self, file: str, result: Dict):
+        imports = result.get("imports") or {}
+        for app_var, base, router in result.get("mounts") or []:
+            child: Optional[Node] = None
+            if router in imports:
+                target = self.resolve_module(file, imports[router])
+                var = self._exported_router(target) if target else None
+                if var:
+                    child = (target, var)
+            else:
+                child = (file, router)
+            if child is not None:
+                self.parents.setdefault(child, []).append(((file, app_var), base))
+
+
+class MountResolver:
+    """
+    2. faz: sembol tablosundan her router düğümünün tam prefix listesini
+    (iç içe mount zincirleri dahil) hesaplar ve rotalara uygular.
+    """
+
+    def __init__(self, table: SymbolTable):
+        self.table = table
+        self._memo: Dict[Node, List[str]] = {}
+
+    def prefixes(self, node: Node, _visiting=None) -> List[str]:
+        """`node`un kökten itibaren tüm mount prefix'leri; mount edilmemişse [""]."""
+        if node in self._memo:
+            return self._memo[node]
+        visiting = _visiting if _visiting is not None else set()
+        if node in visiting:
+            return [""]   # döngüsel mount: zinciri burada kes
+        visiting.add(node)
+        out: List[str] = []
+        for parent, base in self.table.parents.get(node, ()):
+            for prefix in self.prefixes(parent, visiting):
+                full = _combine_paths(prefix, base)
+                if full not in out:
+                    out.append(full)
+        visiting.discard(node)
+        self._memo[node] = out or [""]
+        return self._memo[node]
+
+    def _local_mounts(self, file: str, source: str) -> List[Tuple[str, str]]:
+        """Dosya içinde `source` router'ını mount eden (ebeveyn değişken, base) çiftleri."""
+        result = self.table.results.get(file) or {}
+        if source not in (result.get("router_vars") or []):
+            return []
+        return [(app_var, base) for app_var, base, router in result.get("mounts") or [] if router == source]
+
+    def _paths(self, file: str, source: str, path: str) -> List[str]:
+        """
+        Rotanın dosyalar arası prefix'ler uygulanmış path'leri. Parser dosya içi
+        doğrudan mount base'ini zaten uygulamıştır; yerel mount'un ebeveyninden
+        gelen kısım eklenir. Router ayrıca export edilip başka dosyada mount
+        edildiyse, o mount'un prefix'leri yerel base çıkarılmış path'e uygulanır.
+        """
+        local = self._local_mounts(file, source)
+        if not local:
+            return [_combine_paths(prefix, path) for prefix in self.prefixes((file, source))]
+        parents = {app_var for app_var, _ in local}
+        if len(parents) == 1:
+            out = [_combine_paths(prefix, path) for prefix in self.prefixes((file, parents.pop()))]
+        else:
+            out = [path]   # birden fazla ebeveyn: hangi kaydın hangi base'ten geldiği bilinmiyor
+        # parser yerel base başına bir kayıt üretir; dış mount'lar yalnızca ilk base'in kaydına uygulanır
+        first = local[0][1].rstrip("/")
+        if path.startswith(first):
+            raw = path[len(first):]
+            for parent, base in self.table.parents.get((file, source), ()):
+                if parent[0] == file:
+                    continue
+                for prefix in self.prefixes(parent):
+                    full = _combine_paths(_combine_paths(prefix, base), raw)
+                    if full not in out:
+                        out.append(full)
+        return out
+
+    def resolve_file(self, file: str) -> List:
+        """Tek dosyanın rotaları, dosyalar arası prefix'ler uygulanmış olarak."""
+        routes = []
+        for route in self.table.results[file]["routes"]:
+            paths = self._paths(file, route.source, route.path)
+            if paths == [route.path]:
+                routes.append(route)
+                continue
+            for path in paths:
+                routes.append(route.with_path(path))
+        return routes
+
+    def resolve(self) -> List:
+        routes = []
+        for file in self.table.results:
+            routes.extend(self.resolve_file(file))
+        return routes
+
+
+def resolve_mounts(results: Iterable[Tuple[str, Dict]]) -> List:
+    """(dosya, analiz_sonucu) çiftlerinden dosyalar arası mount'ları çözülmüş rota listesi."""
+    return MountResolver(SymbolTable(results)).resolve()
@@ -0,0 +1,263 @@
+import os
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+from authgraph.core.analyzer import SKIP_TIME, ScanReport, _scan_file, iter_project_results
+from authgraph.core.cache import ParseCache
+from authgraph.core.resolver import MountResolver, SymbolTable
+from authgraph.exporter.csv_exporter import export_to_csv_stream
+from authgraph.scanner.file_scanner import (DEFAULT_EXCLUDES, DEFAULT_EXTENSIONS, DEFAULT_MAX_BYTES, ProjectIgnore,
+                                            iter_js_files)
+from authgraph.scanner.fs_watcher import DEBOUNCE_S, iter_changes, make_watcher
+
+
+class LiveProject:
+    """
+    Proje rotalarını bellekte güncel tutar: ilk taramadan sonra yalnızca
+    değişen dosyalar yeniden parse edilir. Değişen dosyaların mount / import /
+    export bilgisi aynı kaldıysa yalnızca onların rotaları yeniden çözülür;
+    değiştiyse sembol tablosu bellekteki sonuçlardan yeniden kurulur (diğer
+    dosyalar okunmaz). Her güncellemede çıktı dosyası atomik olarak yeniden
+    yazılır ve `snapshot_path` verildiyse Neo4j'ye yalnızca fark gönderilir.
+
+    Graph snapshot'ı bellekte tutulur ve diske yalnızca flush() ile yazılır;
+    ilk farkı uygulamadan önce diskteki eski snapshot silinir. Process yarıda
+    ölürse bir sonraki açılış snapshot bulamaz ve graph'ı baştan yazar (eski
+    snapshot'la yanlış fark hesaplamak yerine).
+    """
+
+    def __init__(self, root: str, out_path: Optional[str] = None,
+                 export: Callable = export_to_csv_stream, snapshot_path: Optional[str] = None, graph=None,
+                 cache_path: Optional[str] = None, workers=None, on_update: Optional[Callable[[Dict], None]] = None,
+                 **discover):
+        self.root = root
+        self.out_path = out_path
+        self.export = export
+        self.snapshot_path = snapshot_path
+        self.graph = graph
+        self.cache_path = cache_path
+        self.workers = workers
+        self.on_update = on_update
+        self.discover = discover
+        self.extensions = tuple(e.lower() for e in discover.get("extensions", DEFAULT_EXTENSIONS))
+        self.excluded = frozenset(discover.get("excludes", DEFAULT_EXCLUDES) or ())
+        self.max_bytes = discover.get("max_bytes", DEFAULT_MAX_BYTES)
+        # ilk keşifteki ignore / .gitignore kuralları olaylara da uygulanır
+        self.ignore = ProjectIgnore(root, discover.get("ignore", ()), discover.get("use_gitignore", True))
+        self.results: Dict[str, Dict] = {}
+        self.parsed: Dict[str, tuple] = {}   # izleme sırasında parse edilenler: dosya -> (stat, hash)
+        self.routes: List = []
+        self.report = ScanReport()
+        self.resolver: Optional[MountResolver] = None
+        self.resolved: Dict[str, List] = {}   # dosya -> mount'ları çözülmüş rotaları
+        self._dirty: set = set()
+        self.snapshot: Optional[Dict] = None
+        self._snapshot_dirty = False
+
+    # ---- tarama ----
+
+    def scan(self) -> Dict:
+        """İlk (tam) tarama; cache_path verildiyse değişmeyen dosyalar okunmaz."""
+        started = time.perf_counter()
+        self.report = ScanReport()
+        self.results = dict(iter_project_results(self.root, workers=self.workers, report=self.report,
+                                                 cache_path=self.cache_path, **self.discover))
+        self.resolver = None
+        return self._publish(started, changed=len(self.results), removed=0)
+
+    def _rel(self, path: str) -> str:
+        return os.path.relpath(path, self.root).replace(os.sep, "/")
+
+    def _wanted(self, path: str, is_dir: bool = False) -> bool:
+        if not is_dir and not path.lower().endswith(self.extensions):
+            return False
+        rel = self._rel(path)
+        if rel == ".":
+            return True
+        parts = rel.split("/")
+        if any(part in self.excluded for part in (parts if is_dir else parts[:-1])):
+            return False
+        return not self.ignore.ignored(rel, is_dir)
+
+    def _discover(self, folder: str) -> set:
+        """Klasörü ilk taramadaki kurallarla (üst klasörlerin .gitignore'ları dahil) yeniden keşfeder."""
+        if not self._wanted(folder, is_dir=True):
+            return set()
+        rel = self._rel(folder)
+        if rel == ".":
+            return set(iter_js_files(folder, **self.discover))
+        options = dict(self.discover, rules=self.ignore.rules(rel.rpartition("/")[0]), rel_root=rel)
+        options.pop("ignore", None)
+        return set(iter_js_files(folder, **options))
+
+    def _parse(self, file: str) -> Optional[Dict]:
+        try:
+            # stat okumadan önce alınır: arada dosya değişirse cache kaydı eskir, yanlış sonuç tutulmaz
+            st = os.stat(file)
+        except OSError:
+            return None
+        if self.max_bytes is not None and st.st_size > self.max_bytes:
+            self.report.add_skipped(file, "size")
+            return None
+        _, result, error, digest, _, _ = _scan_file((file, None))
+        if error == SKIP_TIME:
+            self.report.add_skipped(file, SKIP_TIME)
+        elif error:
+            self.report.add_error(file, error)
+        else:
+            self.parsed[file] = (st, digest)
+        return result
+
+    @staticmethod
+    def _symbols(result: Optional[Dict]) -> tuple:
+        """Dosyalar arası çözümlemeyi etkileyen kısım (rotalar hariç)."""
+        if not result:
+            return ()
+        keys = ("app_vars", "router_vars", "mounts", "imports", "exports")
+        if not any(result.get(k) for k in keys):
+            return ()
+        return tuple(repr(result.get(k)) for k in keys)
+
+    def _set(self, file: str, result: Optional[Dict]) -> bool:
+        """Dosyanın sonucunu günceller; bir şey değiştiyse True."""
+        old = self.results.get(file)
+        if result is None:
+            if old is None:
+                return False
+            del self.results[file]
+        elif old == result:
+            return False
+        else:
+            self.results[file] = result
+        if self._symbols(old) != self._symbols(result):
+            self.resolver = None   # mount grafiği değişti: tamamı yeniden çözülür
+        self._dirty.add(file)
+        return True
+
+    def apply(self, paths: Iterable[str]) -> Optional[Dict]:
+        """
+        Değişen yolları uygular. Dosya: yeniden parse / silinmişse çıkarılır.
+        Klasör: altındaki dosyalar yeniden keşfedilir (yeni klasör, taşıma, inotify
+        kuyruk taşması). Hiçbir dosyanın sonucu değişmediyse (ör. yalnızca
+        yorum değişti) çıktılar yeniden yazılmaz, None döner.
+        """
+        started = time.perf_counter()
+        changed = removed = 0
+        for path in sorted(set(paths)):
+            if os.path.isdir(path):
+                live = self._discover(path)
+                prefix = os.path.join(path, "")
+                stale = [f for f in self.results if f.startswith(prefix) and f not in live]
+                targets = [(f, None) for f in stale] + [(f, self._parse(f)) for f in sorted(live)]
+            elif os.path.isfile(path):
+                if not self._wanted(path):
+                    continue
+                targets = [(path, self._parse(path))]
+            else:
+                # silinen dosya ya da klasör
+                prefix = os.path.join(path, "")
+                targets = [(f, None) for f in self.results if f == path or f.startswith(prefix)]
+            for file, result in targets:
+                if self._set(file, result):
+                    if result is None:
+                        removed += 1
+                    else:
+                        changed += 1
+        if not changed and not removed:
+            return None
+        return self._publish(started, changed, removed)
+
+    # ---- yayınlama ----
+
+    def _resolve(self):
+        if self.resolver is None:
+            self.resolver = MountResolver(SymbolTable(self.results.items()))
+            self.resolved = {file: self.resolver.resolve_file(file) for file in self.results}
+        else:
+            table = self.resolver.table
+            for file in self._dirty:
+                if file in self.results:
+                    table.results[file] = self.results[file]
+                    self.resolved[file] = self.resolver.resolve_file(file)
+                else:
+                    table.results.pop(file, None)
+                    self.resolved.pop(file, None)
+        self._dirty = set()
+        self.routes = [route for file in self.results for route in self.resolved[file]]
+
+    def _sync(self) -> Dict:
+        from authgraph.core.neo4j_writer import apply_snapshot_diff, get_graph, graph_snapshot, load_snapshot, wipe_graph
+        graph = self.graph if self.graph is not None else get_graph()
+        started = time.perf_counter()
+        new = graph_snapshot(self.routes)
+        if self.snapshot is None:
+            self.snapshot = load_snapshot(self.snapshot_path)
+            if self.snapshot is None:
+                wipe_graph(graph)
+                self.snapshot = graph_snapshot([])
+        if not self._snapshot_dirty:
+            if os.path.exists(self.snapshot_path):
+                os.remove(self.snapshot_path)
+            self._snapshot_dirty = True
+        # hata olursa eski snapshot kalır; sonraki fark aynı değişiklikleri yeniden dener
+        stats = apply_snapshot_diff(graph, self.snapshot, new)
+        self.snapshot = new
+        stats["seconds"] = round(time.perf_counter() - started, 3)
+        return stats
+
+    def _publish(self, started: float, changed: int, removed: int) -> Dict:
+        self._resolve()
+        summary = {"files": len(self.results), "changed": changed, "removed": removed,
+                   "routes": len(self.routes)}
+        if self.out_path:
+            base, ext = os.path.splitext(self.out_path)
+            tmp = f"{base}.tmp{ext}"
+            self.export(self.routes, tmp)
+            os.replace(tmp, self.out_path)   # okuyanlar yarım dosya görmez
+        if self.snapshot_path:
+            try:
+                summary["neo4j"] = self._sync()
+            except Exception as e:
+                # graph erişilemese de bellek ve dosya güncel kalır
+                summary["neo4j"] = f"{type(e).__name__}: {e}"
+        summary["seconds"] = round(time.perf_counter() - started, 3)
+        if self.on_update is not None:
+            self.on_update(summary)
+        return summary
+
+    def flush(self):
+        """
+        Graph snapshot'ını ve izleme sırasında parse edilen dosyaları diske
+        yazar (bir sonraki açılış yalnızca farkı işler).
+        """
+        if self._snapshot_dirty:
+            from authgraph.core.neo4j_writer import save_snapshot
+            save_snapshot(self.snapshot_path, self.snapshot)
+            self._snapshot_dirty = False
+        if not self.cache_path:
+            return
+        cache = ParseCache(self.cache_path)
+        for file, (st, digest) in self.parsed.items():
+            if file in self.results:
+                cache.store(file, st, digest, self.results[file])
+        cache.prune(self.results)
+        cache.save()
+        self.parsed = {}
+
+    # ---- izleme ----
+
+    def watch(self, stop=None, debounce: float = DEBOUNCE_S, use_inotify: bool = True):
+        """
+        İlk taramadan sonra dosya sistemi olaylarını izler (inotify, yoksa
+        polling) ve her debounce edilmiş değişiklik kümesini apply ile uygular.
+        `stop` (threading.Event) set edilene kadar ya da Ctrl+C ile sürer.
+        """
+        watcher = make_watcher(self.root, use_inotify, extensions=self.extensions, excludes=self.excluded)
+        try:
+            if not self.results:
+                self.scan()
+            for paths in iter_changes(watcher, debounce=debounce, stop=stop):
+                self.apply(paths)
+        finally:
+            watcher.close()
+            self.flush()
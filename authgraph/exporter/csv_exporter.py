@@ -1,6 +1,8 @@
 import csv
 import os
 
+from authgraph.models.permission import ROUTE_FIELDS
+
 
 def _stringify(value):
     if isinstance(value, (list, tuple)):
@@ -16,7 +18,7 @@ def export_to_csv(routes, out_path):
         all_keys.update(r.keys())
 
    
-    preferred = ["file", "line", "source", "method", "path", "role", "roles", "status", "count", "last_seen"]
+    preferred = ["file", "line", "column", "end_line", "end_column", "source", "method", "path", "role", "roles", "status", "count", "last_seen"]
     headers = [k for k in preferred if k in all_keys] + [k for k in sorted(all_keys) if k not in preferred]
 
     # Hiç kayıt yoksa en azından çekirdek kolonları yaz
@@ -29,3 +31,30 @@ def export_to_csv(routes, out_path):
         for r in routes or []:
             row = {h: _stringify(r.get(h, "")) for h in headers}
             writer.writerow(row)
+
+
+def export_to_csv_stream(routes, out_path, fieldnames=ROUTE_FIELDS):
+    """
+    Sabit şemayla tek geçişte yazar; `routes` bir generator olabilir,
+    kayıtlar geldikçe diske yazılır. Yazılan satır sayısını döndürür.
+    """
+    folder = os.path.dirname(out_path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+
+    count = 0
+    with open(out_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(fieldnames)
+        fast = list(fieldnames) == ROUTE_FIELDS
+        for r in routes:
+            if fast and hasattr(r, "to_row"):
+                # RouteRecord.to_row zaten ROUTE_FIELDS sırasında; tek liste alanı roles,
+                # None'ları csv modülü boş yazar
+                row = r.to_row()
+                row[-1] = ";".join(map(str, row[-1]))
+                writer.writerow(row)
+            else:
+                writer.writerow([_stringify(r.get(h, "")) for h in fieldnames])
+            count += 1
+    return count
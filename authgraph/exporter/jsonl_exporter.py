@@ -0,0 +1,23 @@
+import json
+import os
+
+from authgraph.models.permission import ROUTE_FIELDS
+
+
+def export_to_jsonl(routes, out_path, fieldnames=ROUTE_FIELDS):
+    """
+    Her rotayı sabit şemayla bir JSON satırı olarak yazar (JSON Lines).
+    `routes` bir generator olabilir; yazılan satır sayısını döndürür.
+    """
+    folder = os.path.dirname(out_path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+
+    count = 0
+    with open(out_path, "w", encoding="utf-8") as f:
+        for r in routes:
+            row = {h: r.get(h) for h in fieldnames}
+            f.write(json.dumps(row, ensure_ascii=False))
+            f.write("\n")
+            count += 1
+    return count
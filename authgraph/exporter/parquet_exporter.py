@@ -0,0 +1,165 @@
+import os
+import time
+import uuid
+from datetime import datetime, timezone
+from functools import partial
+from typing import Iterable, Optional
+
+# Satır grubu başına rota sayısı; tarama akarken her dolduğunda diske yazılır
+DEFAULT_ROW_GROUP = 64 * 1024
+
+ARROW_EXTENSIONS = (".arrow", ".feather", ".ipc")
+
+
+# Dataset'e eklenen (append) her parçanın satırlarında taramayı tanımlayan kolonlar
+SCAN_COLUMNS = ("scan_id", "scanned_at")
+
+
+def new_scan_id() -> str:
+    """Sıralanabilir tarama kimliği: UTC zaman damgası + kısa rastgele ek."""
+    return time.strftime("%Y%m%dT%H%M%SZ", time.gmtime()) + "-" + uuid.uuid4().hex[:8]
+
+
+def _schema(scan: bool = False):
+    import pyarrow as pa
+
+    dict_str = pa.dictionary(pa.int32(), pa.string())
+    scan_fields = list(zip(SCAN_COLUMNS, (dict_str, pa.timestamp("us", tz="UTC")))) if scan else []
+    return pa.schema([
+        ("file", dict_str),
+        ("line", pa.int32()),
+        ("column", pa.int32()),
+        ("end_line", pa.int32()),
+        ("end_column", pa.int32()),
+        ("source", dict_str),
+        ("method", dict_str),
+        ("path", pa.string()),
+        ("role", dict_str),
+        ("roles", pa.list_(pa.string())),
+    ] + scan_fields)
+
+
+def _open_part(folder: str, scan_id: str):
+    """
+    Taramanın parça dosyasını (part-<scan_id>.parquet) yalnızca yoksa oluşturur:
+    aynı klasöre eş zamanlı eklenen taramalar birbirinin dosyasının üzerine yazamaz.
+    """
+    return open(os.path.join(folder, f"part-{scan_id}.parquet"), "xb")
+
+
+class _ColumnBuffer:
+    """
+    Rotaları satır olarak biriktirip tek seferde kolonlara çevirir (RecordBatch).
+    `constants` şemanın sonundaki, her satırda aynı olan kolonların değerleridir.
+    """
+
+    def __init__(self, schema, constants=()):
+        self.schema = schema
+        self.constants = tuple(constants)
+        self.names = schema.names[:len(schema.names) - len(self.constants)]
+        self.rows = []
+
+    def __len__(self):
+        return len(self.rows)
+
+    def add(self, route):
+        # RouteRecord.to_row zaten şema (ROUTE_FIELDS) sırasında; düz dict'ler için get
+        to_row = getattr(route, "to_row", None)
+        self.rows.append(to_row() if to_row is not None else [route.get(name) for name in self.names])
+
+    def flush(self):
+        import pyarrow as pa
+
+        n = len(self.rows)
+        columns = list(zip(*self.rows)) + [[value] * n for value in self.constants]
+        self.rows = []
+        arrays = [pa.array(col, type=field.type) for col, field in zip(columns, self.schema)]
+        return pa.RecordBatch.from_arrays(arrays, schema=self.schema)
+
+
+def export_to_parquet(routes: Iterable, out_path: str, row_group_size: int = DEFAULT_ROW_GROUP,
+                      append: bool = False, compression: Optional[str] = "zstd",
+                      scan_id: Optional[str] = None) -> int:
+    """
+    Rotaları kolon bazlı yazar: `roles` gerçek liste kolonu, file / source /
+    method / role dictionary-encoded. `routes` bir generator olabilir; her
+    `row_group_size` rotada bir satır grubu diske yazılır, bellek sabit kalır.
+
+    Uzantı .arrow / .feather / .ipc ise Arrow IPC dosyası, aksi halde Parquet yazılır.
+    append=True ise `out_path` bir Parquet dataset klasörü kabul edilir ve
+    sonuçlar yeni bir part-<scan_id>.parquet dosyası olarak eklenir (artımlı taramalar
+    için); klasör tek parça gibi read_routes ile okunur. Eklenen satırlar
+    `scan_id` (verilmezse new_scan_id()) ve `scanned_at` kolonlarını taşır;
+    böylece okuyan taraf aynı rotanın taramalarını ayırt edip son taramayı
+    seçebilir (read_routes(latest=True)). Yazılan satır sayısını döndürür.
+    """
+    try:
+        import pyarrow.ipc as ipc
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise RuntimeError("Parquet/Arrow çıktısı için pyarrow kurulu olmalı: pip install pyarrow") from e
+
+    scan_id = scan_id or new_scan_id()
+    if append:
+        os.makedirs(out_path, exist_ok=True)
+        target = _open_part(out_path, scan_id)
+    else:
+        folder = os.path.dirname(out_path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        target = out_path
+
+    schema = _schema(scan=append)
+    constants = (scan_id, datetime.now(timezone.utc)) if append else ()
+    if not append and out_path.lower().endswith(ARROW_EXTENSIONS):
+        writer = ipc.new_file(target, schema)
+        write = writer.write_batch
+    else:
+        writer = pq.ParquetWriter(target, schema, compression=compression)
+        write = partial(writer.write_batch, row_group_size=row_group_size)
+
+    buf = _ColumnBuffer(schema, constants)
+    count = 0
+    try:
+        for r in routes:
+            buf.add(r)
+            count += 1
+            if len(buf) >= row_group_size:
+                write(buf.flush())
+        if len(buf):
+            write(buf.flush())
+    finally:
+        writer.close()
+        if append:
+            target.close()
+    return count
+
+
+def read_routes(path: str, columns=None, latest: bool = False):
+    """
+    export_to_parquet çıktısını (tek dosya, dataset klasörü ya da Arrow IPC)
+    pyarrow.Table olarak okur. Dictionary kolonlar öyle kalır; bellek eşlemeli okunur.
+    latest=True ise append ile büyüyen dataset'ten yalnızca en son taramanın
+    (en büyük scanned_at) satırları döner.
+    """
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+
+    if os.path.isfile(path) and path.lower().endswith(ARROW_EXTENSIONS):
+        import pyarrow as pa
+
+        with pa.memory_map(path) as source:
+            table = ipc.open_file(source).read_all()
+        return table.select(columns) if columns else table
+    if not latest:
+        return pq.read_table(path, columns=columns, memory_map=True,
+                             read_dictionary=["file", "source", "method", "role", "scan_id"])
+    import pyarrow.compute as pc
+
+    table = pq.read_table(path, memory_map=True, read_dictionary=["file", "source", "method", "role", "scan_id"])
+    if "scanned_at" in table.column_names and table.num_rows:
+        # aynı anda yazılmış iki parça karışmasın diye zaman değil scan_id ile süzülür
+        newest = pc.index(table["scanned_at"], pc.max(table["scanned_at"])).as_py()
+        scan_ids = table["scan_id"].cast("string")
+        table = table.filter(pc.equal(scan_ids, scan_ids[newest]))
+    return table.select(columns) if columns else table
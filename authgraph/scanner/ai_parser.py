@@ -0,0 +1,332 @@
+import hashlib
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from authgraph.scanner.js_lexer import scan_calls
+from authgraph.scanner.line_index import LineIndex
+
+# ====== Ollama / Model Ayarları (ENV ile değiştirilebilir) ======
+OLLAMA_API_URL = os.getenv("OLLAMA_API_URL", "http://localhost:11434")
+OLLAMA_MODEL   = os.getenv("OLLAMA_MODEL", "deepseek-r1:14b")  # örn: deepseek-coder-v2:lite
+TEMPERATURE    = float(os.getenv("OLLAMA_TEMPERATURE", "0.2"))
+NUM_CTX        = int(os.getenv("OLLAMA_NUM_CTX", "8192"))
+MAX_RETRIES    = int(os.getenv("OLLAMA_RETRIES", "2"))
+RETRY_WAIT_S   = float(os.getenv("OLLAMA_RETRY_WAIT", "1.0"))
+REQUEST_TIMEOUT_S = float(os.getenv("OLLAMA_TIMEOUT", "180"))
+MAX_CONCURRENCY = int(os.getenv("OLLAMA_CONCURRENCY", "4"))
+
+# ====== Cache ======
+AI_CACHE_PATH = os.getenv("AUTHGRAPH_AI_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "authgraph", "ai_cache.sqlite"))
+AI_CACHE_MAX_ENTRIES = int(os.getenv("AUTHGRAPH_AI_CACHE_MAX", "5000"))
+
+# Token sayısı için kaba tahmin; kod için ~4 karakter / token
+CHARS_PER_TOKEN = 4
+# Context'in bu kadarı modelin JSON cevabına ayrılır
+RESPONSE_SHARE = 0.25
+
+ROUTE_CALL_NAMES = frozenset(("get", "post", "put", "delete", "patch", "options", "head", "all", "route", "use"))
+
+# ====== AI'ya verilecek katı prompt (parser şeması) ======
+PROMPT = r"""
+Return ONLY valid JSON. No prose, no code fences.
+
+Goal: From the given Express.js/Node.js (or TS) code, extract HTTP routes and authorization info.
+Output MUST follow the schema *exactly* and reflect real code (do not invent).
+
+Schema:
+{
+  "routes": [
+    {
+      "file": "string",
+      "line": 0,
+      "source": "string",
+      "method": "GET|POST|PUT|DELETE|PATCH|OPTIONS|HEAD|ALL",
+      "path": "string (must start with /)",
+      "roles": ["string"],
+      "role": "string|null"
+    }
+  ]
+}
+
+Rules & Extraction Hints:
+- Recognize simple calls: app.get('/x', ...), router.post('/y', ...).
+- Recognize chained routing: router.route('/x').get(...).post(...).
+- Recognize mounts: app.use('/base', routerVar) and resolve full path: full = base + subpath (normalize slashes).
+- Detect roles from middlewares like checkRole('admin') or checkRole("user") within the call args; collect all roles.
+- If multiple roles found, include them all in "roles" (deduped) and set "role" = first one.
+- method MUST be uppercased. path MUST start with "/".
+- file is the provided filename; line is approximate starting line for the route (best effort).
+- If unknown/none, use [] for roles and null for role.
+- Do not include duplicates. Do not output extra fields.
+
+CODE (filename: <<<FILENAME>>>):
+<<<CODE>>>
+"""
+
+_PROMPT_TOKENS = len(PROMPT) // CHARS_PER_TOKEN
+
+
+# ======================= CACHE =======================
+
+class AICache:
+    """
+    Model + prompt (kod dahil) hash'ine göre AI cevaplarını saklayan disk üzeri
+    LRU cache (sqlite). Aynı kod için model bir daha çağrılmaz.
+    """
+
+    def __init__(self, path: str = AI_CACHE_PATH, max_entries: int = AI_CACHE_MAX_ENTRIES):
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT, atime REAL)")
+        self.db.commit()
+
+    @staticmethod
+    def key(model: str, prompt: str) -> str:
+        return hashlib.sha256(f"{model}\0{prompt}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[dict]:
+        with self.lock:
+            row = self.db.execute("SELECT value FROM cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self.db.execute("UPDATE cache SET atime = ? WHERE key = ?", (time.time(), key))
+            self.db.commit()
+        return json.loads(row[0])
+
+    def put(self, key: str, value: dict):
+        with self.lock:
+            self.db.execute("INSERT OR REPLACE INTO cache (key, value, atime) VALUES (?, ?, ?)",
+                            (key, json.dumps(value), time.time()))
+            # en uzun süredir kullanılmayanları at
+            self.db.execute(
+                "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY atime DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,))
+            self.db.commit()
+
+
+_default_cache = None
+_default_session = None
+_defaults_lock = threading.Lock()
+
+
+def default_cache() -> AICache:
+    global _default_cache
+    with _defaults_lock:
+        if _default_cache is None:
+            _default_cache = AICache()
+        return _default_cache
+
+
+def make_session(pool_size: int = MAX_CONCURRENCY) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def default_session() -> requests.Session:
+    global _default_session
+    with _defaults_lock:
+        if _default_session is None:
+            _default_session = make_session()
+        return _default_session
+
+
+# ======================= AI PARSER CORE =======================
+
+def _ollama_call(session: requests.Session, base_url: str, endpoint: str, payload: dict) -> requests.Response:
+    return session.post(f"{base_url}{endpoint}", json=payload, timeout=REQUEST_TIMEOUT_S)
+
+
+def _backoff(attempt: int) -> float:
+    # 1s, 2s, 4s, ... + küçük jitter (eş zamanlı istekler aynı anda dönmesin)
+    return RETRY_WAIT_S * (2 ** (attempt - 1)) * (1 + random.random() * 0.25)
+
+
+def _ollama_json(prompt: str, session: requests.Session, base_url: str = OLLAMA_API_URL,
+                 model: str = OLLAMA_MODEL) -> dict:
+    """
+    /api/generate -> JSON; 404 ise /api/chat fallback. Üstel bekleme ile retry'lı.
+    """
+    last_err = None
+    options = {"temperature": TEMPERATURE, "num_ctx": NUM_CTX}
+    for attempt in range(1, MAX_RETRIES + 1):
+        try:
+            # 1) generate
+            r = _ollama_call(session, base_url, "/api/generate", {
+                "model": model,
+                "prompt": prompt,
+                "stream": False,
+                "format": "json",
+                "options": options,
+            })
+            if r.status_code == 200:
+                data = r.json().get("response", "")
+                return json.loads(data)
+
+            # 2) chat fallback sadece 404'te
+            if r.status_code == 404:
+                rc = _ollama_call(session, base_url, "/api/chat", {
+                    "model": model,
+                    "stream": False,
+                    "format": "json",
+                    "options": options,
+                    "messages": [
+                        {"role": "system", "content": "Return ONLY valid JSON. No prose."},
+                        {"role": "user", "content": prompt},
+                    ]
+                })
+                if rc.status_code == 200:
+                    data = rc.json()["message"]["content"]
+                    return json.loads(data)
+                last_err = RuntimeError(f"chat error {rc.status_code}: {rc.text}")
+            else:
+                last_err = RuntimeError(f"generate error {r.status_code}: {r.text}")
+        except Exception as e:
+            last_err = e
+
+        if attempt < MAX_RETRIES:
+            time.sleep(_backoff(attempt))
+    raise last_err or RuntimeError("Ollama unknown error")
+
+
+def _normalize_record(rec: Dict[str, Any]) -> Dict[str, Any]:
+    file = rec.get("file") or "<memory>"
+    try:
+        line = int(rec.get("line") or 0)
+    except Exception:
+        line = 0
+    source = rec.get("source") or "app"
+    method = (rec.get("method") or "GET").upper().strip()
+    path = (rec.get("path") or "").strip()
+    if path and not path.startswith("/"):
+        path = "/" + path
+
+    roles = rec.get("roles") or []
+    if not isinstance(roles, list):
+        roles = [str(roles)]
+    # dedupe
+    roles = list(dict.fromkeys(r for r in (str(x).strip() for x in roles) if r))
+    role = rec.get("role") if rec.get("role") is not None else (roles[0] if roles else None)
+
+    return {
+        "file": file,
+        "line": line,
+        "source": source,
+        "method": method,
+        "path": path,
+        "roles": roles,
+        "role": role
+    }
+
+
+# ======================= CHUNKING =======================
+
+def code_budget_chars(num_ctx: int = NUM_CTX) -> int:
+    """Tek istekte gönderilebilecek kod uzunluğu (karakter)."""
+    tokens = int(num_ctx * (1 - RESPONSE_SHARE)) - _PROMPT_TOKENS
+    return max(1024, tokens * CHARS_PER_TOKEN)
+
+
+def split_code(js_code: str, budget: int) -> List[Tuple[int, str]]:
+    """
+    Context'e sığmayan kodu rota çağrısı sınırlarından parçalara böler.
+    (satır_ofseti, parça) listesi döndürür. Rota çağrısından önceki kısım
+    (require'lar, router tanımları) her parçanın başına bağlam olarak eklenir.
+    """
+    if len(js_code) <= budget:
+        return [(0, js_code)]
+
+    lines = LineIndex(js_code)
+    # yalnızca en dıştaki rota çağrılarının satır başları kesim noktası olur
+    cuts, outer_end = [], -1
+    for call in scan_calls(js_code):
+        if call.start > outer_end and call.parent < 0 and call.parts[-1] in ROUTE_CALL_NAMES:
+            cuts.append(lines.starts[lines.line(call.start) - 1])
+        if call.start > outer_end or call.parent >= 0:
+            # zincirdeki .get(...).post(...) çağrıları aynı bloğu uzatır
+            outer_end = max(outer_end, call.close)
+    if not cuts or cuts[0] == 0:
+        cuts = [0] + [c for c in cuts if c]
+
+    preamble = js_code[:cuts[0]][-(budget // 4):]
+    room = max(1, budget - len(preamble))
+    bounds = sorted(set(cuts)) + [len(js_code)]
+
+    # ardışık rota blokları bütçe dolana kadar aynı parçaya eklenir
+    spans: List[Tuple[int, int]] = []
+    start = bounds[0]
+    for prev, end in zip(bounds, bounds[1:]):
+        if end - start > room and prev > start:
+            spans.append((start, prev))
+            start = prev
+        # tek rota bile sığmıyorsa sabit boyutlu dilimlere düş
+        while end - start > room:
+            spans.append((start, start + room))
+            start += room
+    if start < len(js_code):
+        spans.append((start, len(js_code)))
+    # model satırları parçaya göre sayar; ofset preamble satırlarını da düşer
+    head_lines = preamble.count("\n")
+    return [(lines.line(s) - 1 - head_lines, preamble + js_code[s:e]) for s, e in spans]
+
+
+def _dedupe(records: List[Dict]) -> List[Dict]:
+    seen, out = set(), []
+    for r in records:
+        key = (r["method"], r["path"], tuple(r["roles"]))
+        if key not in seen:
+            seen.add(key)
+            out.append(r)
+    return out
+
+
+def parse_express_code_ai(js_code: str, filename: str = "<memory>", cache: Optional[AICache] = None,
+                          session: Optional[requests.Session] = None, base_url: str = OLLAMA_API_URL,
+                          model: str = OLLAMA_MODEL, num_ctx: int = NUM_CTX,
+                          max_concurrency: int = MAX_CONCURRENCY, use_cache: bool = True) -> List[Dict]:
+    """
+    Kodu (gerekirse parçalayarak) modele gönderir ve rota kayıtlarını döndürür.
+    Aynı model + kod için cevap cache'ten gelir. Parçalar en fazla
+    `max_concurrency` eş zamanlı istekle, paylaşılan HTTP session'ı üzerinden gönderilir.
+    """
+    cache = (cache or default_cache()) if use_cache else None
+    session = session or default_session()
+    chunks = split_code(js_code, code_budget_chars(num_ctx))
+
+    def run(chunk: Tuple[int, str]) -> List[Dict]:
+        offset, code = chunk
+        prompt = PROMPT.replace("<<<CODE>>>", code).replace("<<<FILENAME>>>", filename)
+        key = AICache.key(model, prompt) if cache else None
+        parsed = cache.get(key) if cache else None
+        if parsed is None:
+            parsed = _ollama_json(prompt, session, base_url, model)
+            if cache:
+                cache.put(key, parsed)
+        items = parsed.get("routes", []) if isinstance(parsed, dict) else []
+        records = [_normalize_record(x) for x in items]
+        for r in records:
+            r["file"] = filename
+            if offset and r["line"]:
+                r["line"] = max(1, r["line"] + offset)
+        return records
+
+    if len(chunks) == 1:
+        return _dedupe(run(chunks[0]))
+    with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(chunks)))) as pool:
+        results = list(pool.map(run, chunks))
+    return _dedupe([r for part in results for r in part])
@@ -0,0 +1,74 @@
+import tarfile
+import zipfile
+from typing import BinaryIO, Callable, Iterator, Optional, Tuple
+
+from authgraph.scanner.file_scanner import DEFAULT_EXCLUDES, DEFAULT_EXTENSIONS
+
+ARCHIVE_EXTENSIONS = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz")
+_EXCLUDED = frozenset(DEFAULT_EXCLUDES)
+
+
+def is_js_name(name: str) -> bool:
+    """Uzantı uygun ve yol node_modules / dist gibi dışlanan bir klasörde değil."""
+    if not name.lower().endswith(DEFAULT_EXTENSIONS):
+        return False
+    return not any(part in _EXCLUDED for part in name.replace("\\", "/").split("/")[:-1])
+
+
+def is_archive_name(name: str) -> bool:
+    return name.lower().endswith(ARCHIVE_EXTENSIONS)
+
+
+def _iter_zip(fileobj, max_bytes, on_skip):
+    with zipfile.ZipFile(fileobj) as zf:
+        for info in zf.infolist():
+            # isim ve boyut merkez dizinden okunur; JS olmayan üyelerin verisine dokunulmaz
+            if info.is_dir() or not is_js_name(info.filename):
+                continue
+            if max_bytes is not None and info.file_size > max_bytes:
+                if on_skip is not None:
+                    on_skip(info.filename, "size")
+                continue
+            yield info.filename, zf.read(info)
+
+
+def _iter_tar(fileobj, max_bytes, on_skip):
+    # "r|*": akış modu; arşiv tek geçişte okunur, seek gerekmez
+    with tarfile.open(fileobj=fileobj, mode="r|*") as tf:
+        for member in tf:
+            if not member.isfile() or not is_js_name(member.name):
+                continue
+            if max_bytes is not None and member.size > max_bytes:
+                if on_skip is not None:
+                    on_skip(member.name, "size")
+                continue
+            f = tf.extractfile(member)
+            if f is not None:
+                yield member.name, f.read()
+
+
+def iter_archive_sources(fileobj: BinaryIO, max_bytes: Optional[int] = None,
+                         on_skip: Optional[Callable[[str, str], None]] = None) -> Iterator[Tuple[str, bytes]]:
+    """
+    zip / tar(.gz|.bz2|.xz) arşivindeki .js üyelerini diske açmadan
+    (isim, içerik) olarak üretir. `fileobj` zip için seek edilebilir olmalıdır.
+    `max_bytes`ı aşan üyeler hiç açılmaz; on_skip(isim, "size") ile bildirilir.
+    """
+    if fileobj.seekable() and zipfile.is_zipfile(fileobj):
+        fileobj.seek(0)
+        yield from _iter_zip(fileobj, max_bytes, on_skip)
+    else:
+        if fileobj.seekable():
+            fileobj.seek(0)
+        yield from _iter_tar(fileobj, max_bytes, on_skip)
+
+
+def count_archive_sources(fileobj: BinaryIO) -> Optional[int]:
+    """Zip'teki .js üye sayısı (ilerleme için); tar'da sayı ancak okuyarak bulunur -> None."""
+    if not (fileobj.seekable() and zipfile.is_zipfile(fileobj)):
+        return None
+    fileobj.seek(0)
+    with zipfile.ZipFile(fileobj) as zf:
+        count = sum(1 for i in zf.infolist() if not i.is_dir() and is_js_name(i.filename))
+    fileobj.seek(0)
+    return count
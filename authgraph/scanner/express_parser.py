@@ -1,57 +1,45 @@
 
 import re
-from typing import List, Dict, Tuple
+import time
+from typing import List, Dict, Optional
+
+from authgraph.models.permission import RouteRecord
+from authgraph.scanner.extractors import (RE_AUTH_MIDDLEWARE, RE_ROLE_CALL, RE_STRING_LITERAL, ROLE_FUNCTIONS,
+                                          ExtractContext, Extractor, applicable, register)
+from authgraph.scanner.js_lexer import CallSite, ParseBudgetExceeded, scan_calls
+from authgraph.scanner.line_index import LineIndex
 
 METHODS = ("get", "post", "put", "delete", "patch", "options", "all")
 
-# --- Yardımcı regex'ler ---
-RE_APP_VARS = re.compile(r'\b(?:const|let|var)\s+([A-Za-z_$][\w$]*)\s*=\s*express\s*\(\s*\)', re.MULTILINE)
-RE_ROUTER_VARS = re.compile(r'\b(?:const|let|var)\s+([A-Za-z_$][\w$]*)\s*=\s*express\.Router\s*\(\s*\)', re.MULTILINE)
+METHOD_SET = frozenset(METHODS)
 
-# app.use('/base', routerVar) eşleşmeleri
-RE_MOUNTS = re.compile(
-    r'([A-Za-z_$][\w$]*)\.use\(\s*(?P<q>["\'])(?P<base>.*?)\1\s*,\s*([A-Za-z_$][\w$]*)\s*\)',
-    re.DOTALL
-)
+# Path / rol literal'leri için üst sınır; bozuk girdide eşleşme denemesi dosya sonuna yürümez
+MAX_LITERAL = 2048
 
-# router.route('/x').get(...).post(...)
-RE_ROUTE_CHAIN = re.compile(
-    r'(?P<obj>[A-Za-z_$][\w$]*)\.route\(\s*(?P<path>(?P<q1>["\'])(?P<spath>.*?)(?P=q1)|`(?P<tpath>[^`]+)`)\s*\)\s*(?P<chain>(?:\.(?:get|post|put|delete|patch|options|all)\s*$begin:math:text$.*?$end:math:text$)+)',
-    re.DOTALL
+# app.use('/base', routerVar) çağrısının argümanları
+RE_MOUNT_ARGS = re.compile(
+    r'^\s*(?P<q>["\'])(?P<base>[^\n]{0,%d}?)(?P=q)\s*,\s*(?P<router>[A-Za-z_$][\w$]*)\s*$' % MAX_LITERAL
 )
 
-# Basit method çağrısı: app.get("/x", ...)
-RE_SIMPLE_CALL_HEAD = re.compile(
-    r'(?P<obj>[A-Za-z_$][\w$]*)\.(?P<method>get|post|put|delete|patch|options|all)\s*\(',
-    re.DOTALL
+# app.use('/base', require('./routes/x'))
+RE_MOUNT_REQUIRE = re.compile(
+    r'^\s*(?P<q>["\'])(?P<base>[^\n]{0,%d}?)(?P=q)\s*,\s*require\s*\(\s*(?P<q2>["\'])(?P<spec>[^"\']+)(?P=q2)\s*\)\s*$'
+    % MAX_LITERAL
 )
 
+# require('./x') argümanı
+RE_REQUIRE_ARG = re.compile(r'^\s*(?P<q>["\'])(?P<spec>[^"\']+)(?P=q)\s*$')
+
 # Argüman içinden path’i çekmek için (1. argüman string ya da template literal)
 RE_FIRST_ARG_PATH = re.compile(
-    r'^\s*(?:(?P<q>["\'])(?P<spath>.*?)(?P=q)|`(?P<tpath>[^`]+)`)',
-    re.DOTALL
+    r'^\s*(?:(?P<q>["\'])(?P<spath>[^\n]{0,%d}?)(?P=q)|`(?P<tpath>[^`]{1,%d})`)' % (MAX_LITERAL, MAX_LITERAL)
 )
 
-# Argüman içinden rolleri çekmek için
-RE_CHECK_ROLE = re.compile(r'checkRole\s*\(\s*(?P<q>["\'])(?P<role>.*?)\1\s*\)', re.DOTALL)
+# Sabit path'ten sonra ilk argüman bitmeli: `,` ya da argüman listesinin sonu
+RE_ARG_END = re.compile(r'\s*(?:,|$)')
 
-def _find_var_names(pattern: re.Pattern, code: str) -> List[str]:
-    return list({m.group(1) for m in pattern.finditer(code)})
-
-def _find_mounts(code: str) -> List[Tuple[str, str, str]]:
-    """
-    appVar.use('/base', routerVar) -> (appVar, '/base', routerVar)
-    """
-    mounts = []
-    for m in RE_MOUNTS.finditer(code):
-        app_var = m.group(1)
-        base = m.group('base') or ""
-        after = code[m.end():]
-        full = m.group(0)
-        tail_id = re.findall(r',\s*([A-Za-z_$][\w$]*)\s*\)', full)
-        router_var = tail_id[-1] if tail_id else ''
-        mounts.append((app_var, base, router_var))
-    return mounts
+# Handler gövdesinin başladığı yer; middleware araması burada biter
+RE_HANDLER_START = re.compile(r'=>|\bfunction\b|\basync\b')
 
 def _combine_paths(base: str, path: str) -> str:
     if not base:
@@ -64,165 +52,220 @@ def _combine_paths(base: str, path: str) -> str:
         return base + '/' + path
     return base + path
 
-def _arg_block_at(code: str, start_idx: int) -> Tuple[str, int]:
-    """
-    Bir method çağrısının '(' konumundan başlayarak, kapanan ')' noktasına kadar
-    olan argüman bloğunu (parantez dengeleme ile) döndürür.
-    """
-    assert code[start_idx] == '('
-    i = start_idx
-    depth = 0
-    in_squote = in_dquote = in_template = False
-    escape = False
-    while i < len(code):
-        ch = code[i]
-        if escape:
-            escape = False
-            i += 1
-            continue
-        if ch == '\\':
-            escape = True
-            i += 1
-            continue
-
-        if in_template:
-            if ch == '`':
-                in_template = False
-            i += 1
-            continue
-
-        if in_squote:
-            if ch == "'":
-                in_squote = False
-            i += 1
-            continue
-
-        if in_dquote:
-            if ch == '"':
-                in_dquote = False
-            i += 1
-            continue
-
-        if ch == "'":
-            in_squote = True
-        elif ch == '"':
-            in_dquote = True
-        elif ch == '`':
-            in_template = True
-        elif ch == '(':
-            depth += 1
-        elif ch == ')':
-            depth -= 1
-            if depth == 0:
-                # argümanlar: code[start_idx+1:i], ve kapanış i konumunda
-                return code[start_idx+1:i], i
-        i += 1
-
-    # Eşleşmedi: hatalı JS
-    return "", start_idx
+def _literal_is_whole_arg(arg_str: str, end: int) -> bool:
+    """`'/x/' + id`, `'/x'.concat(id)` gibi ifadelerde literal path'in yalnızca başıdır."""
+    return RE_ARG_END.match(arg_str, end) is not None
+
 
 def _extract_path_from_args(arg_str: str) -> str:
+    """İlk argüman sabit bir string / template ise path'i; ifadeyse "" (dinamik path)."""
     m = RE_FIRST_ARG_PATH.search(arg_str)
-    if not m:
+    if not m or not _literal_is_whole_arg(arg_str, m.end()):
         return ""
     return m.group('spath') or m.group('tpath') or ""
 
 def _extract_roles_from_args(arg_str: str) -> List[str]:
-    roles = [mm.group('role') for mm in RE_CHECK_ROLE.finditer(arg_str)]
-    
-    dedup = []
-    for r in roles:
-        if r not in dedup:
-            dedup.append(r)
-    return dedup
-
-def _line_no(code: str, idx: int) -> int:
-    return code.count('\n', 0, idx) + 1
-
-def parse_express_code(js_code: str, filename: str = "<memory>") -> List[Dict]:
-    results: List[Dict] = []
-
-    app_vars = _find_var_names(RE_APP_VARS, js_code) or ["app"]  
-    router_vars = _find_var_names(RE_ROUTER_VARS, js_code)
-    mounts = _find_mounts(js_code)  # (appVar, base, routerVar)
-
-    # Router mount base path haritası
-    base_by_router = {}
-    for app_var, base, rvar in mounts:
-        base_by_router.setdefault(rvar, []).append(base)  # aynı router birden fazla yerde mount olabilir
-
-    # --- 1) route chain kalıbı: router.route('/x').get(...).post(...) ---
-    for m in RE_ROUTE_CHAIN.finditer(js_code):
-        obj = m.group('obj')
-        raw_path = (m.group('spath') or m.group('tpath') or "")
-        chain = m.group('chain')
-        base_prefixes = base_by_router.get(obj, [""]) if obj in router_vars else [""]
-
-        # zincirin içinde tek tek .get(...), .post(...), ... bloklarını yakala
-        for m2 in re.finditer(r'\.(?P<method>get|post|put|delete|patch|options|all)\s*\(', chain):
-            method = m2.group('method').upper()
-            
-            global_idx = m.start('chain') + m2.start()
-            
-            open_paren_idx = js_code.find('(', global_idx)
-            arg_str, close_idx = _arg_block_at(js_code, open_paren_idx)
-            roles = _extract_roles_from_args(arg_str)
-            if not roles:
-               
-                
-                roles = []
-
-            line_no = _line_no(js_code, m.start())
-            for base in base_prefixes:
-                full_path = _combine_paths(base, raw_path)
-                results.append({
-                    "file": filename,
-                    "line": line_no,
-                    "source": obj,
-                    "method": method,
-                    "path": full_path,
-                    "roles": roles,
-                    "role": roles[0] if roles else None,  # geri uyumluluk için
-                })
-
-    # --- 2) basit çağrılar: app.get('/x', ...), router.post('/y', ...) ---
-    for m in RE_SIMPLE_CALL_HEAD.finditer(js_code):
-        obj = m.group('obj')
-        method = m.group('method').upper()
-
-        
-        open_paren_idx = js_code.find('(', m.end() - 1)
-        if open_paren_idx == -1:
-            continue
-        arg_str, close_idx = _arg_block_at(js_code, open_paren_idx)
-        if not arg_str:
-            continue
-
-        raw_path = _extract_path_from_args(arg_str)
-        roles = _extract_roles_from_args(arg_str)
-        line_no = _line_no(js_code, m.start())
-
-        
-        if raw_path == "":
-            continue
-
-        
-        if obj in router_vars:
-            bases = base_by_router.get(obj, [""])
-        else:
-           
-            bases = [""]
-
-        for base in bases:
-            full_path = _combine_paths(base, raw_path)
-            results.append({
-                "file": filename,
-                "line": line_no,
-                "source": obj,
-                "method": method,
-                "path": full_path,
-                "roles": roles,
-                "role": roles[0] if roles else None,
-            })
-
-    return results
+    # yapılandırmadaki rol fonksiyonlarının (checkRole, requireRole, authorize, ...) string argümanları;
+    # dict.fromkeys sırayı koruyarak tekrarları atar
+    if "(" not in arg_str:
+        return []
+    return list(dict.fromkeys(s.group('value') for mm in RE_ROLE_CALL.finditer(arg_str)
+                              if mm.group('name') in ROLE_FUNCTIONS
+                              for s in RE_STRING_LITERAL.finditer(mm.group('args'))))
+
+def parse_express_code(js_code: str, filename: str = "<memory>") -> List[RouteRecord]:
+    return analyze_express_code(js_code, filename)["routes"]
+
+def _collect_symbols(js_code: str, calls: List[CallSite], imports: Dict[str, str]):
+    """
+    Çağrı listesinden app/router değişkenlerini ve mount'ları çıkarır.
+    appVar.use('/base', routerVar) -> (appVar, '/base', routerVar)
+    `const x = require('./m')` ve satır içi `require('./m')` mount'ları `imports`a yazılır;
+    satır içi require'ın router adı "require(./m)" olur.
+    """
+    app_vars, router_vars, mounts = set(), set(), []
+    for call in calls:
+        if call.target and call.callee == "express":
+            app_vars.add(call.target)
+        elif call.target and call.callee == "express.Router":
+            router_vars.add(call.target)
+        elif call.target and call.callee == "require":
+            m = RE_REQUIRE_ARG.match(call.args(js_code))
+            if m:
+                imports[call.target] = m.group('spec')
+        elif call.parent < 0 and call.callee.endswith(".use"):
+            args = call.args(js_code)
+            m = RE_MOUNT_ARGS.match(args)
+            if m:
+                mounts.append((call.parts[-2], m.group('base') or "", m.group('router')))
+                continue
+            m = RE_MOUNT_REQUIRE.match(args)
+            if m:
+                name = f"require({m.group('spec')})"
+                imports[name] = m.group('spec')
+                mounts.append((call.parts[-2], m.group('base') or "", name))
+    return sorted(app_vars), sorted(router_vars), mounts
+
+def _route_head(calls: List[CallSite], call: CallSite):
+    """
+    `.get(...)` zincir halkasından geriye yürüyüp `obj.route(...)` çağrısını bulur.
+    """
+    head = calls[call.parent]
+    while head.parent >= 0 and head.parts[-1] in METHOD_SET:
+        head = calls[head.parent]
+    if head.parent < 0 and len(head.parts) >= 2 and head.parts[-1] == "route":
+        return head
+    return None
+
+def _uncertain_kind(js_code: str, call: CallSite, raw_path: str, known: bool) -> str:
+    """
+    Regex taramasının güvenemediği rota çağrısının türü; sorun yoksa "".
+    unclosed      : argüman parantezi kapanmamış
+    dynamic_path  : path değişken / ifade / ${...} template
+    unknown_auth  : rol fonksiyonları dışında yetki middleware'i ve hiç rol yok
+                    (rol fonksiyonu da varsa roller zaten bilinir; AI'ye gönderilmez)
+    """
+    if call.close < 0:
+        return "unclosed" if known else ""
+    if raw_path == "" or "${" in raw_path:
+        return "dynamic_path" if known else ""
+    arg_str = call.args(js_code)
+    m = RE_HANDLER_START.search(arg_str)
+    end = m.start() if m else len(arg_str)
+    if RE_AUTH_MIDDLEWARE.search(arg_str, 0, end) and not _extract_roles_from_args(arg_str):
+        return "unknown_auth"
+    return ""
+
+def _emit(ctx: ExtractContext, call: CallSite, source: str, method: str, paths: List[str], roles: List[str]):
+    """`call` konumunda, her path için bir rota kaydı ekler (extractor'ların ortak çıkışı)."""
+    line_no, col = ctx.lines.position(call.start)
+    end_line, end_col = ctx.lines.position(call.close) if call.close >= 0 else (line_no, col)
+    for path in paths:
+        ctx.routes.append(RouteRecord(
+            ctx.filename, line_no, source, method, path, roles,
+            column=col, end_line=end_line, end_column=end_col,
+        ))
+
+class ExpressExtractor(Extractor):
+    """
+    `obj.get('/x', ...)` ve `router.route('/x').get(...)` çağrıları. Sahiplenilmemiş
+    tüm nesneler için çalışan genel extractor; aynı çağrı biçimini kullanan
+    framework'ler (Fastify kısa yolları vb.) de buradan geçer.
+    """
+
+    name = "express"
+    keywords = ("express", "Router")
+    # `map.get(key)` / `Promise.all([...])` gibi sıradan çağrılar eşleşmesin diye
+    # string / template ile başlayan argüman aranır
+    patterns = (r'\.\s*(?:%s|use|route)\s*\(\s*[\'"`]' % "|".join(METHODS),)
+    order = 100
+
+    def extract(self, ctx: ExtractContext):
+        js_code, calls, deadline = ctx.js_code, ctx.calls, ctx.deadline
+
+        # Router mount base path haritası
+        base_by_router = {}
+        for app_var, base, rvar in ctx.mounts:
+            base_by_router.setdefault(rvar, []).append(base)  # aynı router birden fazla yerde mount olabilir
+
+        router_vars = set(ctx.router_vars)
+        known_vars = set(ctx.app_vars) | router_vars
+
+        for n, call in enumerate(calls):
+            if deadline is not None and n % 1024 == 0 and time.perf_counter() > deadline:
+                raise ParseBudgetExceeded(f"{len(calls)} çağrıdan {n}. çağrıda süre aşıldı")
+            parts = call.parts
+            if len(parts) < 2 or parts[-1] not in METHOD_SET:
+                continue
+            method = parts[-1].upper()
+            arg_str = call.args(js_code)
+
+            if call.parent >= 0:
+                # --- 1) route chain kalıbı: router.route('/x').get(...).post(...) ---
+                head = _route_head(calls, call)
+                if head is None:
+                    continue
+                obj = head.parts[-2]
+                raw_path = _extract_path_from_args(head.args(js_code))
+            else:
+                # --- 2) basit çağrılar: app.get('/x', ...), router.post('/y', ...) ---
+                obj = parts[-2]
+                raw_path = _extract_path_from_args(arg_str)
+            if obj in ctx.claimed:
+                continue
+
+            kind = _uncertain_kind(js_code, call, raw_path, obj in known_vars)
+            if kind:
+                ctx.uncertain.append([ctx.lines.line(call.start),
+                                      ctx.lines.line(call.close) if call.close >= 0 else None, kind])
+            if call.parent < 0 and raw_path == "":
+                continue
+
+            bases = base_by_router.get(obj, [""]) if obj in router_vars else [""]
+            _emit(ctx, call, obj, method, [_combine_paths(base, raw_path) for base in bases],
+                  _extract_roles_from_args(arg_str))
+
+register(ExpressExtractor())
+
+def empty_result() -> Dict:
+    """Rota içermeyen (ön filtreden geçmeyen) dosyanın analiz sonucu."""
+    return {"routes": [], "app_vars": ["app"], "router_vars": [], "mounts": [], "imports": {},
+            "exports": [], "uncertain": []}
+
+def analyze_express_code(js_code: str, filename: str = "<memory>", time_budget: Optional[float] = None,
+                         timings: Optional[Dict[str, float]] = None, extractors: Optional[List] = None) -> Dict:
+    """
+    Dosyayı bir kez lex edip kayıtlı tüm framework extractor'larını (Express,
+    Koa, Fastify, NestJS, eklentiler; bkz. authgraph.scanner.extractors) aynı
+    çağrı listesi üzerinde çalıştırır. Anahtar kelime ön filtresinden hiçbir
+    extractor geçmezse dosya lex edilmez.
+
+    Rotaların yanında dosyanın app/router değişkenlerini, mount'larını,
+    import/export'larını da döndürür (cache ve dosyalar arası mount
+    çözümlemesi için). `uncertain`, regex'in eksik okumuş olabileceği rota
+    çağrılarıdır: [satır, bitiş_satırı, tür] (hibrit modda yalnızca bu
+    bölgeler AI parser'a gönderilir).
+
+    `time_budget` (saniye) verilirse süre aşıldığında ParseBudgetExceeded fırlatılır.
+    `timings` verilirse "lex" (çağrı taraması) ve "extract" (sembol / path / rol
+    çıkarımı) süreleri saniye olarak yazılır. `extractors` verilirse ön filtre
+    atlanır (çağıran ham baytlar üzerinde zaten uygulamıştır).
+    """
+    started = time.perf_counter()
+    if extractors is None:
+        extractors = applicable(js_code)
+    if not extractors:
+        if timings is not None:
+            timings["lex"] = time.perf_counter() - started
+            timings["extract"] = 0.0
+        return empty_result()
+
+    deadline = started + time_budget if time_budget is not None else None
+    symbols = {"imports": [], "exports": []}
+    calls = scan_calls(js_code, symbols, deadline)
+    lexed = time.perf_counter()
+    imports = dict(symbols["imports"])
+
+    app_vars, router_vars, mounts = _collect_symbols(js_code, calls, imports)
+    ctx = ExtractContext(js_code, filename, calls, LineIndex(js_code), imports, sorted(set(symbols["exports"])),
+                         app_vars or ["app"], router_vars, mounts, deadline)
+    for extractor in extractors:
+        extractor.extract(ctx)
+    if len(extractors) > 1:
+        # framework extractor'ları ayrı geçişlerde ekler; kaynak sırasına getir (sıralama kararlı)
+        ctx.routes.sort(key=lambda r: (r.line, r.column))
+        ctx.uncertain.sort(key=lambda u: u[0])
+
+    if timings is not None:
+        timings["lex"] = lexed - started
+        timings["extract"] = time.perf_counter() - lexed
+
+    return {
+        "routes": ctx.routes,
+        "app_vars": ctx.app_vars,
+        "router_vars": sorted(set(ctx.router_vars)),
+        "mounts": [list(m) for m in ctx.mounts],
+        "imports": ctx.imports,
+        "exports": ctx.exports,
+        "uncertain": ctx.uncertain,
+    }
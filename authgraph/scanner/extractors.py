@@ -0,0 +1,192 @@
+import hashlib
+import importlib
+import json
+import os
+import re
+from typing import Dict, List, Optional, Set
+
+# Yetki middleware kalıpları koddan değil bu JSON dosyasından okunur (bkz. DEFAULT_AUTH_CONFIG)
+AUTH_CONFIG_PATH = os.getenv("AUTHGRAPH_AUTH_CONFIG")
+
+# Yerleşiklere ek olarak yüklenecek extractor modülleri (virgülle ayrılmış, ör. "acme.hapi_parser")
+EXTRA_EXTRACTORS = os.getenv("AUTHGRAPH_EXTRACTORS", "")
+
+# Her modül import edilirken register() ile kendi extractor'ını kaydeder
+BUILTIN_EXTRACTORS = (
+    "authgraph.scanner.koa_parser",
+    "authgraph.scanner.fastify_parser",
+    "authgraph.scanner.nest_parser",
+    "authgraph.scanner.express_parser",
+)
+
+DEFAULT_AUTH_CONFIG = {
+    # String argümanları rol sayılan çağrılar / decorator'lar:
+    # checkRole('admin'), requireRole('a', 'b'), authorize(['a', 'b']), @Roles('admin')
+    "role_functions": ["checkRole", "requireRole", "hasRole", "hasAnyRole", "authorize", "Roles"],
+    # Rol bilgisi vermeyen ama yetki kontrolü gibi görünen middleware isimlerinde
+    # geçen parçalar (passport.authenticate, AuthGuard, isAdmin, ...); bunlar
+    # hibrit modda AI parser'a "unknown_auth" olarak gönderilir
+    "auth_keywords": ["auth", "role", "perm", "guard", "acl", "protect", "jwt", "passport", "login", "admin"],
+}
+
+
+def load_auth_config(path: Optional[str] = AUTH_CONFIG_PATH) -> Dict[str, List[str]]:
+    """Varsayılanların üzerine `path`teki JSON'u uygular; verilmeyen anahtarlar varsayılan kalır."""
+    config = {key: list(values) for key, values in DEFAULT_AUTH_CONFIG.items()}
+    if path:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        for key in config:
+            if key in data:
+                config[key] = [str(v) for v in data[key]]
+    return config
+
+
+AUTH_CONFIG = load_auth_config()
+
+
+class ExtractContext:
+    """
+    Bir dosyanın tek geçişlik tarama durumu; tüm extractor'lar aynı token /
+    çağrı listesini paylaşır, dosya bir kez okunup bir kez lex edilir.
+
+    claimed : bir framework extractor'ının sahiplendiği nesne değişkenleri;
+              genel (Express) extractor bunların çağrılarını tekrar saymaz.
+    """
+
+    def __init__(self, js_code: str, filename: str, calls, lines, imports: Dict[str, str],
+                 exports: List[str], app_vars: List[str], router_vars: List[str], mounts: List,
+                 deadline: Optional[float] = None):
+        self.js_code = js_code
+        self.filename = filename
+        self.calls = calls
+        self.lines = lines
+        self.imports = imports
+        self.exports = exports
+        self.app_vars = app_vars
+        self.router_vars = router_vars
+        self.mounts = mounts
+        self.deadline = deadline
+        self.claimed: Set[str] = set()
+        self.routes: List = []
+        self.uncertain: List = []
+
+
+class Extractor:
+    """
+    Framework extractor'ı. Ön filtre dosya lex edilmeden önce uygulanır:
+    `keywords` literal'lerinden biri geçmiyor ve `patterns` regex'lerinden
+    hiçbiri eşleşmiyorsa extract hiç çağrılmaz. Regex'ler literal bir
+    karakterle başlamalıdır (ör. `.get('` arayan regex noktayla); böylece re modülü aday
+    konumları C hızında atlar. Küçük `order` önce çalışır; genel Express
+    extractor'ı en sonda, sahiplenilmemiş çağrılar için çalışır. Ham bayt
+    üzerinde de çalışabilmeleri için filtreler ASCII olmalıdır.
+    """
+
+    name = ""
+    keywords: tuple = ()
+    patterns: tuple = ()
+    order = 50
+
+    def _prefilters(self, raw: bool):
+        """(literal'ler, derlenmiş regex'ler); raw=True ise ham bayt sürümleri (bir kez derlenir)."""
+        attr = "_raw_prefilters" if raw else "_text_prefilters"
+        cached = self.__dict__.get(attr)
+        if cached is None:
+            if raw:
+                cached = (tuple(k.encode("utf-8") for k in self.keywords),
+                          tuple(re.compile(p.encode("utf-8")) for p in self.patterns))
+            else:
+                cached = (tuple(self.keywords), tuple(re.compile(p) for p in self.patterns))
+            setattr(self, attr, cached)
+        return cached
+
+    def applies(self, data) -> bool:
+        """
+        `data` str ya da ASCII uyumlu kodlamada ham baytlar (bytes / mmap) olabilir;
+        ham baytlarda dosya hiç str'ye çevrilmeden elenebilir.
+        """
+        keywords, patterns = self._prefilters(not isinstance(data, str))
+        for keyword in keywords:
+            if data.find(keyword) >= 0:
+                return True
+        for regex in patterns:
+            if regex.search(data):
+                return True
+        return False
+
+    def extract(self, ctx: ExtractContext):
+        raise NotImplementedError
+
+
+_registry: Dict[str, Extractor] = {}
+_ordered: Optional[List[Extractor]] = None
+_loaded = False
+
+
+def register(extractor: Extractor) -> Extractor:
+    """Extractor'ı kaydeder (aynı isim yeniden kaydedilirse eskisinin yerini alır)."""
+    global _ordered
+    _registry[extractor.name] = extractor
+    _ordered = None
+    return extractor
+
+
+def registered() -> List[Extractor]:
+    """Kayıtlı extractor'lar, çalışma sırasıyla. İlk çağrıda yerleşik ve ek modüller yüklenir."""
+    global _loaded, _ordered
+    if not _loaded:
+        _loaded = True
+        extra = [m.strip() for m in EXTRA_EXTRACTORS.split(",") if m.strip()]
+        for module in BUILTIN_EXTRACTORS + tuple(extra):
+            importlib.import_module(module)
+    if _ordered is None:
+        _ordered = sorted(_registry.values(), key=lambda e: (e.order, e.name))
+    return _ordered
+
+
+def fingerprint() -> str:
+    """
+    Yüklü yetki yapılandırması ve kayıtlı extractor'ların (isim, sıra, sınıf)
+    kısa özeti. Parse cache'i bunu sürümüne katar; role_functions ya da
+    AUTHGRAPH_EXTRACTORS değişince eski sonuçlar kullanılmaz.
+    """
+    extractors = [[e.name, e.order, f"{type(e).__module__}.{type(e).__qualname__}"] for e in registered()]
+    data = json.dumps({"auth": AUTH_CONFIG, "extractors": extractors}, sort_keys=True)
+    return hashlib.blake2b(data.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def applicable(js_code) -> List[Extractor]:
+    """
+    Ön filtreden geçen extractor'lar, çalışma sırasıyla. Rota içermeyen
+    dosyada maliyet birkaç memchr / memmem taramasıdır (lex'in yüzde biri
+    mertebesinde). Tüm filtreler tek bir alternasyon regex'inde birleştirilmez:
+    literal ile başlamayan alternasyonda re her konumu tek tek dener, ayrı
+    taramaların toplamından onlarca kat yavaştır. `js_code` ham bayt da
+    olabilir (bkz. Extractor.applies).
+    """
+    return [e for e in registered() if e.applies(js_code)]
+
+
+# --- Ortak yardımcılar (yapılandırmadan derlenen kalıplar) ---
+
+RE_STRING_LITERAL = re.compile(r'(?P<q>["\'])(?P<value>[^"\'\n]{0,256})(?P=q)')
+
+
+def _names_pattern(names) -> str:
+    return "|".join(re.escape(n) for n in sorted(set(names), key=len, reverse=True))
+
+
+# Yapılandırmadaki rol fonksiyonları; isim sayısından bağımsız O(1) üyelik kontrolü
+ROLE_FUNCTIONS = frozenset(AUTH_CONFIG["role_functions"])
+
+# Herhangi bir `isim(argümanlar)` çağrısı (iç içe parantezsiz); isim ROLE_FUNCTIONS'ta
+# aranır. Tek regex, rol fonksiyonu sayısı kadar alternatif denemez.
+RE_ROLE_CALL = re.compile(r'(?<![\w$])(?P<name>[A-Za-z_$][\w$]*)\s*\(\s*(?P<args>[^()]{0,512}?)\s*\)')
+
+# Rol fonksiyonları dışındaki, yetki kontrolü gibi görünen middleware'ler
+RE_AUTH_MIDDLEWARE = re.compile(
+    r'(?<![\w$.])(?!(?:%s)\b)'
+    r'(?P<name>[A-Za-z_$][\w$.]{0,64}?(?i:%s)[\w$]{0,64})'
+    r'\s*(?=[,(])' % (_names_pattern(AUTH_CONFIG["role_functions"]), _names_pattern(AUTH_CONFIG["auth_keywords"]))
+)
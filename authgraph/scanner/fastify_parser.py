@@ -0,0 +1,83 @@
+import re
+
+from authgraph.scanner.express_parser import MAX_LITERAL, METHOD_SET, _emit, _extract_roles_from_args
+from authgraph.scanner.extractors import ExtractContext, Extractor, register
+
+# fastify.route({ method: 'GET' | ['GET', 'POST'], url: '/x', preHandler: ..., handler })
+RE_ROUTE_METHOD = re.compile(r'\bmethod\s*:\s*(?P<value>\[[^\]]{0,256}\]|["\'][A-Za-z]+["\'])')
+RE_ROUTE_URL = re.compile(r'\b(?:url|path)\s*:\s*(?P<q>["\'`])(?P<url>[^\n]{0,%d}?)(?P=q)' % MAX_LITERAL)
+RE_WORD = re.compile(r'[A-Za-z]+')
+
+# fastify.register(plugin | require('./x'), { prefix: '/users' })
+RE_REGISTER = re.compile(
+    r'^\s*(?:(?P<plugin>[A-Za-z_$][\w$]*)|require\s*\(\s*(?P<q>["\'])(?P<spec>[^"\']+)(?P=q)\s*\))\s*,'
+    r'\s*\{[^{}]{0,%d}?\bprefix\s*:\s*(?P<q2>["\'`])(?P<prefix>[^\n]{0,%d}?)(?P=q2)' % (MAX_LITERAL, MAX_LITERAL)
+)
+
+# Plugin dosyası: function routes(fastify, opts) {...} / module.exports = async function (fastify) {...}
+RE_NAMED_PLUGIN = re.compile(r'(?:async\s+)?function\s+(?P<name>[A-Za-z_$][\w$]*)\s*\(\s*(?P<param>[A-Za-z_$][\w$]*)')
+RE_ANON_PLUGIN = re.compile(
+    r'(?:module\.exports\s*=|export\s+default)\s*(?:async\s+)?(?:function\s*\(\s*|\(\s*)(?P<param>[A-Za-z_$][\w$]*)'
+)
+
+
+class FastifyExtractor(Extractor):
+    """
+    Fastify: nesne biçimli `route({ method, url, ... })` çağrıları ve
+    `register(plugin, { prefix })` mount'ları. Kısa yollar (`fastify.get(...)`)
+    Express ile aynı biçimde olduğundan genel extractor'da kalır.
+
+    Export edilen plugin fonksiyonunun ilk parametresi (genelde `fastify`)
+    router sayılır; böylece başka dosyadaki register prefix'i dosyalar arası
+    çözümlemede bu parametre üzerinden tanımlanan rotalara uygulanır.
+    """
+
+    name = "fastify"
+    keywords = ("fastify",)
+    order = 20
+
+    def extract(self, ctx: ExtractContext):
+        js_code = ctx.js_code
+        for m in RE_NAMED_PLUGIN.finditer(js_code):
+            if m.group("name") in ctx.exports:
+                self._plugin_param(ctx, m.group("param"))
+        m = RE_ANON_PLUGIN.search(js_code)
+        if m:
+            # lexer `module.exports = async function` için "async" / "function" yazar
+            ctx.exports = [e for e in ctx.exports if e not in ("async", "function")]
+            self._plugin_param(ctx, m.group("param"))
+
+        for call in ctx.calls:
+            parts = call.parts
+            if call.parent >= 0 or len(parts) < 2:
+                continue
+            if parts[-1] == "register":
+                m = RE_REGISTER.match(call.args(js_code))
+                if m is None:
+                    continue
+                plugin = m.group("plugin")
+                if plugin is None:
+                    plugin = f"require({m.group('spec')})"
+                    ctx.imports[plugin] = m.group("spec")
+                ctx.mounts.append((parts[-2], m.group("prefix"), plugin))
+            elif parts[-1] == "route" and parts[-2] not in METHOD_SET:
+                arg_str = call.args(js_code)
+                if not arg_str.lstrip().startswith("{"):
+                    continue   # router.route('/x') zinciri: Express biçimi
+                url = RE_ROUTE_URL.search(arg_str)
+                method = RE_ROUTE_METHOD.search(arg_str)
+                if url is None or method is None:
+                    continue
+                roles = _extract_roles_from_args(arg_str)
+                for name in RE_WORD.findall(method.group("value")):
+                    _emit(ctx, call, parts[-2], name.upper(), [url.group("url")], roles)
+
+    @staticmethod
+    def _plugin_param(ctx: ExtractContext, param: str):
+        if param not in ctx.router_vars:
+            ctx.router_vars.append(param)
+        if param not in ctx.exports:
+            ctx.exports = sorted(ctx.exports + [param])
+
+
+register(FastifyExtractor())
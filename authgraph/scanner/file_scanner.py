@@ -1,9 +1,209 @@
 import os
+import re
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
 
-def find_js_files(directory):
-    js_files = []
-    for root, _, files in os.walk(directory):
-        for file in files:
-            if file.endswith('.js'):
-                js_files.append(os.path.join(root, file))
-    return js_files
\ No newline at end of file
+DEFAULT_EXTENSIONS = (".js", ".ts")
+
+# Uygulama rotası içermeyen, ama dosya sayısını katlayan klasörler
+DEFAULT_EXCLUDES = (
+    "node_modules", "bower_components", ".git", ".hg", ".svn",
+    "dist", "build", "coverage", ".next", ".nuxt", ".cache",
+)
+
+# Bundle / minified dosyaları atlamak için varsayılan boyut sınırı
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024
+
+
+def _translate(pattern: str) -> str:
+    """
+    gitignore glob'unu regex'e çevirir. fnmatch'ten farkı: `*` ve `?` `/`
+    ile eşleşmez; `**/` sıfır ya da daha fazla klasör, sondaki `/**` altındaki
+    her şey demektir.
+    """
+    out = []
+    i, n = 0, len(pattern)
+    while i < n:
+        if pattern.startswith("**/", i) and (i == 0 or pattern[i - 1] == "/"):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i) and i + 2 == n and (i == 0 or pattern[i - 1] == "/"):
+            out.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            out.append("[^/]")
+            i += 1
+        elif pattern[i] == "[":
+            end = pattern.find("]", i + 2)
+            if end < 0:
+                out.append(re.escape("["))
+                i += 1
+                continue
+            body = pattern[i + 1:end]
+            if body[0] in "!^":
+                body = "^" + body[1:]
+            out.append("[" + body.replace("\\", "\\\\") + "]")
+            i = end + 1
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return "(?s:%s)\\Z" % "".join(out)
+
+
+class IgnoreRules:
+    """
+    .gitignore sözdiziminin pratik bir alt kümesi:
+    `!` ile geri alma, sonda `/` (yalnızca klasör), başta `/` ya da ortada `/`
+    (kuralın tanımlandığı klasöre göre tam göreli yolla eşleşir; yoksa
+    yalnızca isimle), `*`, `?` (`/` hariç), `**/`, `/**`. Son eşleşen kural kazanır.
+    """
+
+    def __init__(self, rules: Optional[List[Tuple[str, "re.Pattern", bool, bool]]] = None):
+        self.rules = rules or []
+
+    @staticmethod
+    def parse(lines: Iterable[str], base: str = "") -> List[Tuple[str, "re.Pattern", bool, bool]]:
+        rules = []
+        for raw in lines:
+            line = raw.rstrip("\n").rstrip()
+            if not line or line.startswith("#"):
+                continue
+            negate = line.startswith("!")
+            if negate:
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.strip("/") if dir_only else line
+            # `/` içeren kural (baştaki dahil, ör. `**/gen/out`) klasöre göre tam yolla eşleşir
+            anchored = "/" in line
+            line = line.lstrip("/")
+            regex = re.compile(_translate(line))
+            rules.append((base if anchored else None, regex, negate, dir_only))
+        return rules
+
+    def extend(self, lines: Iterable[str], base: str = "") -> "IgnoreRules":
+        """Alt klasördeki .gitignore için yeni (genişletilmiş) kural seti döndürür."""
+        return IgnoreRules(self.rules + self.parse(lines, base))
+
+    def ignored(self, rel_path: str, name: str, is_dir: bool) -> bool:
+        result = False
+        for base, regex, negate, dir_only in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if base is None:
+                target = name
+            elif base == "":
+                target = rel_path
+            elif rel_path.startswith(base + "/"):
+                target = rel_path[len(base) + 1:]
+            else:
+                continue
+            if regex.match(target):
+                result = not negate
+        return result
+
+
+def _read_ignore_file(path: str) -> List[str]:
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            return f.readlines()
+    except OSError:
+        return []
+
+
+class ProjectIgnore:
+    """
+    Tek tek yollar için iter_js_files ile aynı kararı verir: `ignore`
+    kuralları ve yoldaki her klasörün .gitignore'u. Klasör başına kural seti
+    bir kez kurulur (izleme modunda her olay için ağacı gezmemek için).
+    """
+
+    def __init__(self, directory: str, ignore: Iterable[str] = (), use_gitignore: bool = True):
+        self.directory = directory
+        self.use_gitignore = use_gitignore
+        self._base = IgnoreRules(IgnoreRules.parse(ignore))
+        self._rules = {}
+
+    def rules(self, rel_dir: str) -> IgnoreRules:
+        """`rel_dir` klasörünün içindekilere uygulanan kurallar (kendi .gitignore'u dahil)."""
+        rules = self._rules.get(rel_dir)
+        if rules is None:
+            rules = self._base if rel_dir == "" else self.rules(rel_dir.rpartition("/")[0])
+            if self.use_gitignore:
+                lines = _read_ignore_file(os.path.join(self.directory, *rel_dir.split("/"), ".gitignore"))
+                if lines:
+                    rules = rules.extend(lines, rel_dir)
+            self._rules[rel_dir] = rules
+        return rules
+
+    def ignored(self, rel_path: str, is_dir: bool = False) -> bool:
+        """`rel_path` (`/` ayraçlı) ya da üst klasörlerinden biri yok sayılıyorsa True."""
+        parts = rel_path.split("/")
+        for i, name in enumerate(parts):
+            last = i == len(parts) - 1
+            parent = "/".join(parts[:i])
+            if self.rules(parent).ignored("/".join(parts[:i + 1]), name, is_dir or not last):
+                return True
+        return False
+
+
+def iter_js_files(directory, extensions=DEFAULT_EXTENSIONS, excludes=DEFAULT_EXCLUDES,
+                  ignore: Iterable[str] = (), use_gitignore=True, max_bytes=DEFAULT_MAX_BYTES,
+                  on_skip: Optional[Callable[[str, str], None]] = None,
+                  rules: Optional[IgnoreRules] = None, rel_root: str = "") -> Iterator[str]:
+    """
+    Kaynak dosyalarını os.scandir ile tembel (lazy) olarak üretir; tüm liste
+    bellekte tutulmaz ve parse, gezinti sürerken başlayabilir. Her klasörün
+    girdileri isim sırasıyla gezilir, böylece çıktı sırası deterministiktir.
+
+    extensions : dahil edilecek uzantılar (ör. (".js", ".ts", ".mjs", ".cjs"))
+    excludes   : hiç girilmeyecek klasör isimleri
+    ignore     : ek .gitignore tarzı kurallar; use_gitignore ile .gitignore dosyaları da okunur
+    max_bytes  : bu boyuttan büyük dosyalar atlanır (None: sınırsız)
+    on_skip    : boyut nedeniyle atlanan dosyalar için on_skip(path, sebep)
+    rules      : alt klasör yeniden taranırken üst klasörlerden gelen kurallar
+                 (ProjectIgnore.rules); verilirse `ignore` kullanılmaz
+    rel_root   : `directory`nin proje köküne göre yolu (kurallar buna göre eşleşir)
+    """
+    extensions = tuple(e.lower() for e in extensions)
+    excluded = frozenset(excludes or ())
+    if rules is None:
+        rules = IgnoreRules(IgnoreRules.parse(ignore))
+
+    stack = [(directory, rel_root, rules)]
+    while stack:
+        root, rel_root, rules = stack.pop()
+        if use_gitignore:
+            lines = _read_ignore_file(os.path.join(root, ".gitignore"))
+            if lines:
+                rules = rules.extend(lines, rel_root)
+        try:
+            with os.scandir(root) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            continue
+        subdirs = []
+        for entry in entries:
+            name = entry.name
+            rel = f"{rel_root}/{name}" if rel_root else name
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if name not in excluded and not rules.ignored(rel, name, True):
+                        subdirs.append((entry.path, rel, rules))
+                elif name.lower().endswith(extensions) and entry.is_file():
+                    if rules.ignored(rel, name, False):
+                        continue
+                    if max_bytes is not None and entry.stat().st_size > max_bytes:
+                        if on_skip is not None:
+                            on_skip(entry.path, "size")
+                        continue
+                    yield entry.path
+            except OSError:
+                continue
+        # stack LIFO: alt klasörleri ters sırayla ekle ki isim sırasıyla gezilsin
+        stack.extend(reversed(subdirs))
+
+
+def find_js_files(directory, **options):
+    return list(iter_js_files(directory, **options))
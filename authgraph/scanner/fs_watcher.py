@@ -0,0 +1,188 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+from typing import Dict, Iterator, Optional, Set, Tuple
+
+from authgraph.scanner.file_scanner import DEFAULT_EXCLUDES, DEFAULT_EXTENSIONS, iter_js_files
+
+# Olay patlamalarında (kaydet, format, git checkout) bu kadar sessizlik beklenir
+DEBOUNCE_S = float(os.getenv("AUTHGRAPH_WATCH_DEBOUNCE", "0.2"))
+# Olaylar hiç durmasa bile en geç bu süre sonra değişiklikler işlenir
+MAX_DELAY_S = 1.0
+POLL_INTERVAL_S = 1.0
+
+# inotify sabitleri (linux/inotify.h)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class InotifyWatcher:
+    """
+    Linux inotify (ctypes ile, ek bağımlılık yok). Proje ağacındaki her klasör
+    izlenir; dışlanan klasörlere (node_modules vb.) watch eklenmez. Yeni açılan
+    klasörler otomatik izlenir ve içindeki mevcut dosyalar değişmiş sayılır.
+
+    read(timeout) değişen yolların kümesini döndürür. Klasör yolu "bu klasörü
+    yeniden tara" demektir (klasör silme / taşıma, kuyruk taşması).
+    """
+
+    def __init__(self, root: str, extensions=DEFAULT_EXTENSIONS, excludes=DEFAULT_EXCLUDES):
+        libc_name = ctypes.util.find_library("c")
+        if not hasattr(os, "O_NONBLOCK") or libc_name is None:
+            raise OSError("inotify desteklenmiyor")
+        self.libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self.libc, "inotify_init1"):
+            raise OSError("inotify desteklenmiyor")
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 başarısız")
+        self.root = root
+        self.extensions = tuple(e.lower() for e in extensions)
+        self.excluded = frozenset(excludes or ())
+        self.dirs: Dict[int, str] = {}
+        self._add_tree(root)
+
+    def _add_watch(self, path: str) -> bool:
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            return False   # izin yok ya da watch limiti (fs.inotify.max_user_watches) doldu
+        self.dirs[wd] = path
+        return True
+
+    def _add_tree(self, top: str, found: Optional[Set[str]] = None):
+        for root, dirs, files in os.walk(top):
+            dirs[:] = [d for d in dirs if d not in self.excluded]
+            self._add_watch(root)
+            if found is not None:
+                found.update(os.path.join(root, f) for f in files if f.lower().endswith(self.extensions))
+
+    def read(self, timeout: float) -> Set[str]:
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        try:
+            buf = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+        changed: Set[str] = set()
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(buf):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(buf, offset)
+            offset += EVENT_HEADER.size
+            name = buf[offset:offset + length].rstrip(b"\0")
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                changed.add(self.root)   # olaylar kayboldu: tamamını yeniden tara
+                continue
+            if mask & IN_IGNORED:
+                self.dirs.pop(wd, None)
+                continue
+            folder = self.dirs.get(wd)
+            if folder is None or not name:
+                continue
+            path = os.path.join(folder, os.fsdecode(name))
+            if mask & IN_ISDIR:
+                if os.path.basename(path) in self.excluded:
+                    continue
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    self._add_tree(path, changed)
+                else:
+                    changed.add(path)   # klasör silindi / taşındı
+            elif path.lower().endswith(self.extensions):
+                changed.add(path)
+        return changed
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class PollingWatcher:
+    """
+    inotify olmayan sistemler için: her `interval` saniyede bir dosya listesi
+    ve (mtime, boyut) karşılaştırılır. Büyük ağaçlarda inotify'dan pahalıdır.
+    """
+
+    def __init__(self, root: str, interval: float = POLL_INTERVAL_S, **discover):
+        self.root = root
+        self.interval = interval
+        self.discover = discover
+        self.state = self._snapshot()
+        self._next = time.monotonic() + interval
+
+    def _snapshot(self) -> Dict[str, Tuple[int, int]]:
+        state = {}
+        for path in iter_js_files(self.root, max_bytes=None, **self.discover):
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            state[path] = (st.st_mtime_ns, st.st_size)
+        return state
+
+    def read(self, timeout: float) -> Set[str]:
+        wait = self._next - time.monotonic()
+        if wait > timeout:
+            time.sleep(timeout)
+            return set()
+        time.sleep(max(0.0, wait))
+        self._next = time.monotonic() + self.interval
+        new = self._snapshot()
+        old, self.state = self.state, new
+        changed = {p for p, sig in new.items() if old.get(p) != sig}
+        changed.update(p for p in old if p not in new)
+        return changed
+
+    def close(self):
+        pass
+
+
+def make_watcher(root: str, use_inotify: bool = True, poll_interval: float = POLL_INTERVAL_S,
+                 extensions=DEFAULT_EXTENSIONS, excludes=DEFAULT_EXCLUDES):
+    """Mümkünse InotifyWatcher, değilse PollingWatcher."""
+    if use_inotify:
+        try:
+            return InotifyWatcher(root, extensions, excludes)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(root, poll_interval, extensions=extensions, excludes=excludes)
+
+
+def iter_changes(watcher, debounce: float = DEBOUNCE_S, max_delay: float = MAX_DELAY_S,
+                 stop=None, idle_timeout: float = 0.5) -> Iterator[Set[str]]:
+    """
+    Watcher olaylarını debounce ederek değişen yol kümeleri üretir: ilk olaydan
+    sonra `debounce` saniye sessizlik (ya da en fazla `max_delay`) beklenir ve
+    aradaki tüm olaylar tek küme olarak verilir. `stop` (threading.Event) set
+    edilince biter.
+    """
+    while stop is None or not stop.is_set():
+        changed = watcher.read(idle_timeout)
+        if not changed:
+            continue
+        deadline = time.monotonic() + max_delay
+        while True:
+            left = deadline - time.monotonic()
+            if left <= 0:
+                break
+            more = watcher.read(min(debounce, left))
+            if not more:
+                break
+            changed |= more
+        yield changed
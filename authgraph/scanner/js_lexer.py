@@ -0,0 +1,157 @@
+import re
+import time
+from typing import Dict, List, Optional
+
+# Tek geçişlik JS token'ları. Yorumlar, string'ler ve template literal'ler
+# bütün olarak tüketilir; içlerindeki parantezler çağrı sayılmaz.
+# Kapanmamış yorum / template dosya sonuna, kapanmamış string satır sonuna kadar
+# tek token sayılır; böylece bozuk girdide aynı kuyruk tekrar tekrar taranmaz.
+RE_TOKEN = re.compile(
+    r"""
+      (?P<comment>//[^\n]*|/\*[\s\S]*?(?:\*/|\Z))
+    | (?P<string>'(?:[^'\\\n]|\\[\s\S])*(?:'|$)|"(?:[^"\\\n]|\\[\s\S])*(?:"|$))
+    | (?P<template>`(?:[^`\\]|\\[\s\S])*(?:`|\Z))
+    | (?P<ident>[A-Za-z_$][\w$]*)
+    | (?P<number>\d[\w.]*)
+    | (?P<punct>[^\s\w$])
+    """,
+    re.VERBOSE | re.MULTILINE,
+)
+
+# /.../flags regex literal'i (karakter sınıfları dahil, satırı aşmaz)
+RE_REGEX_LITERAL = re.compile(r"/(?![*/])(?:[^/\\\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/[A-Za-z]*")
+
+# Bu token'lardan sonra gelen `/` bölme değil regex literal başlangıcıdır
+REGEX_PREV = frozenset("( , = : [ ! & | ? { } ; + - * % < > ~ ^".split()) | frozenset(
+    ("", "return", "typeof", "case", "do", "else", "in", "of", "new", "delete", "void", "throw", "yield", "await",
+     "=>", "==", "===", "!=", "!==", "&&", "||"))
+
+# Zaman bütçesi her bu kadar token'da bir kontrol edilir
+DEADLINE_EVERY = 4096
+
+DECL_KEYWORDS = ("const", "let", "var")
+
+
+class ParseBudgetExceeded(Exception):
+    """Dosya, izin verilen parse süresini aştı (bozuk / kasıtlı zararlı girdi)."""
+
+
+class CallSite:
+    """
+    Koddaki bir çağrı: `app.get(...)`, `express.Router()`, zincirde `.post(...)`.
+
+    callee : noktalı isim ("app.get"); zincirli çağrılarda yalnızca metod (".post")
+    start  : çağrının ilk karakteri (zincirde kök çağrınınki)
+    open / close : '(' ve eşleşen ')' konumları; kapanmamışsa close = -1
+    parent : zincirde alıcı çağrının listedeki indeksi, yoksa -1
+    target : `const x = callee(...)` ise "x"
+    """
+
+    __slots__ = ("callee", "start", "open", "close", "parent", "target")
+
+    def __init__(self, callee: str, start: int, open_idx: int, parent: int = -1, target: Optional[str] = None):
+        self.callee = callee
+        self.start = start
+        self.open = open_idx
+        self.close = -1
+        self.parent = parent
+        self.target = target
+
+    @property
+    def parts(self) -> List[str]:
+        return self.callee.split(".")
+
+    def args(self, code: str) -> str:
+        if self.close < 0:
+            return ""
+        return code[self.open + 1:self.close]
+
+    def __repr__(self):
+        return f"CallSite({self.callee!r}, open={self.open}, close={self.close}, parent={self.parent})"
+
+
+def scan_calls(code: str, symbols: Optional[Dict[str, list]] = None,
+               deadline: Optional[float] = None) -> List[CallSite]:
+    """
+    Kodu tek geçişte token'lara ayırır ve tüm çağrıları argüman aralıklarıyla
+    birlikte kaynak sırasına göre döndürür. Süre dosya boyutuyla doğrusaldır.
+
+    `symbols` verilirse aynı geçişte modül sembolleri de toplanır:
+      symbols["imports"] += (isim, modül)  <- import x from './m'
+      symbols["exports"] += isim           <- module.exports = x / export default x
+    (`const x = require('./m')` çağrı listesinde `target` ile zaten görünür.)
+
+    Parantez eşleştirme tek bir yığınla yapılır (her '(' bir kez eşlenir); regex
+    literal'leri ve yorumlar atlanır. `deadline` (time.perf_counter değeri)
+    verilirse aşıldığında ParseBudgetExceeded fırlatılır.
+    """
+    calls: List[CallSite] = []
+    stack: List[int] = []          # açık '(' başına çağrı indeksi ya da -1
+    name: List[str] = []           # o an okunan `a.b.c` ismi
+    name_start = 0
+    name_parent = -1
+    name_target = None
+    last_closed = -1               # en son ')' ile kapanan çağrı
+    prev = prev2 = prev3 = ""      # son üç anlamlı token
+
+    search = RE_TOKEN.search
+    pos = 0
+    count = 0
+    while True:
+        m = search(code, pos)
+        if m is None:
+            break
+        pos = m.end()
+        kind = m.lastgroup
+        if kind == "comment":
+            continue
+        tok = m.group()
+        if tok == "/" and prev in REGEX_PREV:
+            rm = RE_REGEX_LITERAL.match(code, m.start())
+            if rm is not None:
+                # /\(/ gibi literal'lerdeki parantezler çağrı sayılmaz
+                pos = rm.end()
+                kind, tok = "regex", rm.group()
+        count += 1
+        if deadline is not None and count % DEADLINE_EVERY == 0 and time.perf_counter() > deadline:
+            raise ParseBudgetExceeded(f"{len(code)} karakter, {count} token sonrası süre aşıldı")
+
+        if symbols is not None:
+            if kind == "ident" and ((prev == "=" and prev2 == "exports" and prev3 == ".")
+                                    or (prev == "default" and prev2 == "export")):
+                symbols["exports"].append(tok)
+            elif kind == "string" and prev == "from" and prev3 == "import":
+                symbols["imports"].append((prev2, tok[1:-1]))
+
+        if kind == "ident":
+            if prev == "." and name:
+                name.append(tok)
+            elif prev == "." and prev2 == ")" and last_closed >= 0:
+                # router.route('/x').get(  ->  alıcı bir önceki çağrı
+                name = ["", tok]
+                name_parent = last_closed
+                name_start = calls[last_closed].start
+                name_target = None
+            else:
+                name = [tok]
+                name_parent = -1
+                name_start = m.start()
+                name_target = prev2 if prev == "=" and prev3 in DECL_KEYWORDS else None
+        elif tok == "(":
+            if name and prev != ".":
+                calls.append(CallSite(".".join(name), name_start, m.start(), name_parent, name_target))
+                stack.append(len(calls) - 1)
+            else:
+                stack.append(-1)
+            name = []
+        elif tok == ")":
+            idx = stack.pop() if stack else -1
+            if idx >= 0:
+                calls[idx].close = m.start()
+            last_closed = idx
+            name = []
+        elif tok != ".":
+            name = []
+
+        prev3, prev2, prev = prev2, prev, tok
+    return calls
@@ -0,0 +1,97 @@
+import re
+
+from authgraph.scanner.express_parser import (MAX_LITERAL, METHOD_SET, _combine_paths, _emit,
+                                              _extract_roles_from_args, _literal_is_whole_arg, _uncertain_kind)
+from authgraph.scanner.extractors import ExtractContext, Extractor, register
+
+# const router = new Router({ prefix: '/users' })  (koa-router / @koa/router)
+RE_KOA_ROUTER = re.compile(
+    r'(?:const|let|var)\s+(?P<var>[A-Za-z_$][\w$]*)\s*=\s*new\s+(?:[\w$]+\.)?(?:Koa)?Router\s*\(\s*'
+    r'(?P<opts>\{[^{}]{0,%d}\})?' % MAX_LITERAL
+)
+
+RE_PREFIX_OPT = re.compile(r'prefix\s*:\s*(?P<q>["\'`])(?P<prefix>[^"\'`\n]{0,%d}?)(?P=q)' % MAX_LITERAL)
+
+# router.prefix('/v1')
+RE_PREFIX_ARG = re.compile(r'^\s*(?P<q>["\'])(?P<prefix>[^\n]{0,%d}?)(?P=q)\s*$' % MAX_LITERAL)
+
+# parent.use('/base', child.routes(), child.allowedMethods())
+RE_ROUTES_MOUNT = re.compile(
+    r'^\s*(?:(?P<q>["\'])(?P<base>[^\n]{0,%d}?)(?P=q)\s*,\s*)?(?P<router>[A-Za-z_$][\w$]*)\s*\.\s*routes\s*\(\s*\)'
+    % MAX_LITERAL
+)
+
+# router.get('user', '/users/:id', ...) -> isimli rota: path ikinci argüman
+RE_NAMED_ROUTE = re.compile(
+    r'^\s*(?P<q>["\'])[^"\'\n]{0,256}(?P=q)\s*,\s*(?P<q2>["\'`])(?P<path>[^\n]{0,%d}?)(?P=q2)' % MAX_LITERAL
+)
+RE_FIRST_STRING = re.compile(r'^\s*(?P<q>["\'`])(?P<path>[^\n]{0,%d}?)(?P=q)' % MAX_LITERAL)
+
+
+class KoaExtractor(Extractor):
+    """
+    koa-router: `new Router({ prefix })` ile oluşturulan router'ların rotaları
+    (prefix ve `router.prefix()` uygulanmış), isimli rotalar ve
+    `parent.use('/base', child.routes())` mount'ları. Bu router değişkenleri
+    sahiplenilir; genel extractor onları tekrar saymaz.
+    """
+
+    name = "koa"
+    keywords = ("koa",)
+    order = 10
+
+    def extract(self, ctx: ExtractContext):
+        js_code = ctx.js_code
+        prefixes = {}
+        for m in RE_KOA_ROUTER.finditer(js_code):
+            opts = RE_PREFIX_OPT.search(m.group("opts") or "")
+            prefixes[m.group("var")] = opts.group("prefix") if opts else ""
+        if not prefixes:
+            return
+        ctx.claimed.update(prefixes)
+        ctx.router_vars.extend(v for v in prefixes if v not in ctx.router_vars)
+
+        mounts = []
+        for call in ctx.calls:
+            parts = call.parts
+            if call.parent >= 0 or len(parts) < 2:
+                continue
+            if parts[-1] == "prefix" and parts[-2] in prefixes:
+                m = RE_PREFIX_ARG.match(call.args(js_code))
+                if m:
+                    prefixes[parts[-2]] = m.group("prefix")
+            elif parts[-1] == "use":
+                m = RE_ROUTES_MOUNT.match(call.args(js_code))
+                if m:
+                    mounts.append((parts[-2], m.group("base") or "", m.group("router")))
+        # ebeveyn router'ın prefix'i alt router'lara da uygulanır: /api + /v1 + /users
+        ctx.mounts.extend((parent, _combine_paths(prefixes.get(parent, ""), base), child)
+                          for parent, base, child in mounts)
+
+        base_by_router = {}
+        for _, base, router in ctx.mounts:
+            base_by_router.setdefault(router, []).append(base)
+
+        for call in ctx.calls:
+            parts = call.parts
+            if call.parent >= 0 or len(parts) < 2 or parts[-2] not in prefixes or parts[-1] not in METHOD_SET:
+                continue
+            obj = parts[-2]
+            arg_str = call.args(js_code)
+            m = RE_NAMED_ROUTE.match(arg_str) or RE_FIRST_STRING.match(arg_str)
+            if m and not _literal_is_whole_arg(arg_str, m.end()):
+                m = None   # '/x/' + id: dinamik path
+            raw_path = m.group("path") if m else ""
+            kind = _uncertain_kind(js_code, call, raw_path, True)
+            if kind:
+                ctx.uncertain.append([ctx.lines.line(call.start),
+                                      ctx.lines.line(call.close) if call.close >= 0 else None, kind])
+            if not m:
+                continue
+            path = _combine_paths(prefixes[obj], raw_path)
+            _emit(ctx, call, obj, parts[-1].upper(),
+                  [_combine_paths(base, path) for base in base_by_router.get(obj, [""])],
+                  _extract_roles_from_args(arg_str))
+
+
+register(KoaExtractor())
@@ -0,0 +1,28 @@
+from bisect import bisect_right
+from typing import List, Tuple
+
+
+class LineIndex:
+    """
+    Bir dosyanın satır başı offset'leri. Dosya başına bir kez kurulur;
+    offset -> (satır, sütun) dönüşümü ikili arama ile O(log n) yapılır.
+    Satır ve sütunlar 1'den başlar.
+    """
+
+    __slots__ = ("starts",)
+
+    def __init__(self, code: str):
+        starts: List[int] = [0]
+        find = code.find
+        i = find("\n")
+        while i != -1:
+            starts.append(i + 1)
+            i = find("\n", i + 1)
+        self.starts = starts
+
+    def line(self, idx: int) -> int:
+        return bisect_right(self.starts, idx)
+
+    def position(self, idx: int) -> Tuple[int, int]:
+        line = bisect_right(self.starts, idx)
+        return line, idx - self.starts[line - 1] + 1
@@ -0,0 +1,79 @@
+import re
+from typing import List
+
+from authgraph.scanner.express_parser import MAX_LITERAL, _emit, _extract_roles_from_args
+from authgraph.scanner.extractors import ExtractContext, Extractor, register
+
+HTTP_DECORATORS = {"Get": "GET", "Post": "POST", "Put": "PUT", "Delete": "DELETE", "Patch": "PATCH",
+                   "Options": "OPTIONS", "Head": "HEAD", "All": "ALL"}
+
+# @Controller('users') / @Get(':id') / @Controller({ path: 'users' })
+RE_DECORATOR_PATH = re.compile(
+    r'^\s*(?:\{[^{}]{0,%d}?\bpath\s*:\s*)?(?P<q>["\'`])(?P<path>[^\n]{0,%d}?)(?P=q)' % (MAX_LITERAL, MAX_LITERAL)
+)
+RE_CLASS = re.compile(r'\bclass\s+(?P<name>[A-Za-z_$][\w$]*)')
+RE_GAP = re.compile(r'\s*')
+
+
+def _nest_path(*segments: str) -> str:
+    return "/" + "/".join(s.strip("/") for s in segments if s and s.strip("/"))
+
+
+class NestExtractor(Extractor):
+    """
+    NestJS decorator'ları: `@Controller('users')` sınıf prefix'i, `@Get(':id')`
+    vb. metod rotaları. Roller aynı decorator grubundaki rol fonksiyonlarından
+    (`@Roles('admin')`, yapılandırılabilir) gelir; metodda yoksa sınıfınkiler
+    kullanılır. Rota kaynağı controller sınıfının adıdır.
+    (app.setGlobalPrefix / RouterModule prefix'leri uygulanmaz.)
+    """
+
+    name = "nest"
+    keywords = ("@nestjs", "@Controller")
+    order = 30
+
+    def _decorator_groups(self, ctx: ExtractContext) -> List[List]:
+        """Aralarında yalnızca boşluk olan ardışık decorator çağrıları bir grup."""
+        js_code = ctx.js_code
+        groups: List[List] = []
+        last_end = -1
+        for call in ctx.calls:
+            if call.parent >= 0 or call.close < 0:
+                continue
+            at = call.start - 1
+            while at >= 0 and js_code[at].isspace():
+                at -= 1
+            if at < 0 or js_code[at] != "@":
+                continue
+            if groups and last_end >= 0 and RE_GAP.fullmatch(js_code, last_end, at):
+                groups[-1].append(call)
+            else:
+                groups.append([call])
+            last_end = call.close + 1
+        return groups
+
+    def extract(self, ctx: ExtractContext):
+        js_code = ctx.js_code
+        prefix, class_roles, source = "", [], "controller"
+        for group in self._decorator_groups(ctx):
+            text = js_code[group[0].start:group[-1].close + 1]
+            names = [call.callee for call in group]
+            if "Controller" in names:
+                call = group[names.index("Controller")]
+                m = RE_DECORATOR_PATH.match(call.args(js_code))
+                prefix = m.group("path") if m else ""
+                class_roles = _extract_roles_from_args(text)
+                cls = RE_CLASS.search(js_code, group[-1].close)
+                source = cls.group("name") if cls else "controller"
+                continue
+            routes = [call for call in group if call.callee in HTTP_DECORATORS]
+            if not routes:
+                continue
+            roles = _extract_roles_from_args(text) or class_roles
+            for call in routes:
+                m = RE_DECORATOR_PATH.match(call.args(js_code))
+                _emit(ctx, call, source, HTTP_DECORATORS[call.callee],
+                      [_nest_path(prefix, m.group("path") if m else "")], roles)
+
+
+register(NestExtractor())
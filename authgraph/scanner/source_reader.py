@@ -0,0 +1,61 @@
+import codecs
+import mmap
+import os
+from contextlib import contextmanager
+from typing import Iterator, Optional, Tuple, Union
+
+# Bu boyuttan büyük dosyalar okunmak yerine bellek eşlenir (mmap): içerik
+# Python bytes'ına kopyalanmaz, ön filtre ve hash doğrudan sayfa önbelleği üzerinde çalışır
+MMAP_THRESHOLD = int(os.getenv("AUTHGRAPH_MMAP_THRESHOLD", str(1024 * 1024)))
+
+# Önce UTF-32: UTF-32 LE BOM'u UTF-16 LE BOM'uyla başlar
+BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+# Ham baytlar üzerinde ASCII ön filtresi uygulanabilecek (ASCII uyumlu) kodlamalar
+ASCII_COMPATIBLE = frozenset(("utf-8", "utf-8-sig"))
+
+Buffer = Union[bytes, mmap.mmap]
+
+
+@contextmanager
+def open_source(path: str, mmap_threshold: int = MMAP_THRESHOLD) -> Iterator[Buffer]:
+    """
+    Dosyanın ham içeriği: küçük dosyalarda bytes, `mmap_threshold` ve üstünde
+    salt okunur mmap. Değer yalnızca with bloğu içinde geçerlidir.
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0 or size < mmap_threshold:
+            yield f.read()
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm
+
+
+def sniff_encoding(data: Buffer) -> str:
+    """BOM'a bakar (ilk 4 bayt); BOM yoksa UTF-8 varsayılır."""
+    head = bytes(data[:4])
+    for bom, encoding in BOMS:
+        if head.startswith(bom):
+            return encoding
+    return "utf-8"
+
+
+def decode_source(data: Buffer, encoding: Optional[str] = None) -> Tuple[str, Optional[str]]:
+    """
+    İçeriği metne çevirir: (metin, sorun). Kodlama çözülemezse dosya atlanmaz;
+    geçersiz baytlar U+FFFD ile değiştirilir ve sorun açıklaması döner
+    (rotalar genelde ASCII olduğundan sonuç çoğunlukla yine doğrudur).
+    """
+    encoding = encoding or sniff_encoding(data)
+    try:
+        return str(data, encoding), None
+    except UnicodeDecodeError as e:
+        problem = f"{encoding} çözülemedi (bayt {e.start}: {e.reason}); geçersiz baytlar U+FFFD ile değiştirildi"
+        return str(data, encoding, "replace"), problem
@@ -0,0 +1,41 @@
+from authgraph.core.batch import BatchScanner, read_manifest
+from main import export
+import argparse
+
+FORMATS = {"csv": ".csv", "jsonl": ".jsonl", "parquet": ".parquet", "arrow": ".arrow"}
+
+
+def build_parser():
+    ap = argparse.ArgumentParser(description="Manifest'teki tüm depoları ortak bir worker bütçesiyle tarar.")
+    ap.add_argument("manifest", help="satır başına bir depo kökü içeren dosya ('#' yorum)")
+    ap.add_argument("out_dir", help="shard'ların ve index.json'ın yazılacağı klasör")
+    ap.add_argument("--format", choices=sorted(FORMATS), default="csv", help="shard biçimi")
+    ap.add_argument("--workers", type=int, help="tüm depolar için toplam parse process sayısı (varsayılan: CPU)")
+    ap.add_argument("--concurrency", type=int, help="aynı anda taranan depo sayısı (varsayılan: workers)")
+    ap.add_argument("--restart", action="store_true", help="önceki çalıştırmayı yok say, tüm depoları yeniden tara")
+    ap.add_argument("--no-cache", action="store_true", help="depo başına parse cache'i kullanma")
+    return ap
+
+
+if __name__ == "__main__":
+    args = build_parser().parse_args()
+    roots = read_manifest(args.manifest)
+
+    def show(entry):
+        if entry["status"] == "done":
+            print(f"✅ {entry['repo']}: {entry['routes']} rota, {entry['files']} dosya, {entry['seconds']} sn", flush=True)
+        else:
+            print(f"❌ {entry['repo']}: {entry['error']}", flush=True)
+
+    scanner = BatchScanner(args.out_dir, export=export, ext=FORMATS[args.format], workers=args.workers,
+                           concurrency=args.concurrency, resume=not args.restart, cache=not args.no_cache,
+                           on_repo=show)
+    try:
+        index = scanner.run(roots)
+    except KeyboardInterrupt:
+        print("⏸️ Durduruldu; aynı komutla kalan depolardan devam edilir.")
+        raise SystemExit(130)
+    totals = index["totals"]
+    print(f"📦 {totals['done']}/{totals['repos']} depo, {totals['routes']} rota -> {args.out_dir}/index.json")
+    if totals["failed"]:
+        print(f"⚠️ {totals['failed']} depo taranamadı")
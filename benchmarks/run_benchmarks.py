@@ -0,0 +1,131 @@
+"""
+Tarayıcı benchmark'ı. Sentetik proje üretir, her aşamayı ayrı ölçer ve
+sonucu JSON olarak yazar (regresyon takibi için makine tarafından okunur).
+
+    python -m benchmarks.run_benchmarks --files 500 --routes 20 --depth 2 --out bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+from authgraph.core.analyzer import analyze_project
+from authgraph.core.neo4j_writer import push_to_neo4j
+from authgraph.exporter.csv_exporter import export_to_csv, export_to_csv_stream
+from authgraph.scanner.express_parser import parse_express_code
+from authgraph.scanner.file_scanner import find_js_files
+from benchmarks.stubs import StubGraph
+from benchmarks.synthetic import generate_project
+
+
+def _measure(fn, memory):
+    """fn'i çalıştırır; (sonuç, saniye, tepe_bellek_MB | None) döndürür."""
+    started = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - started
+    peak_mb = None
+    if memory:
+        # tracemalloc süreyi bozduğu için bellek ayrı bir çalıştırmada ölçülür
+        tracemalloc.start()
+        fn()
+        peak_mb = round(tracemalloc.get_traced_memory()[1] / 1e6, 2)
+        tracemalloc.stop()
+    return result, seconds, peak_mb
+
+
+def _stage(name, fn, count_of, memory, unit):
+    result, seconds, peak_mb = _measure(fn, memory)
+    items = count_of(result)
+    return result, {
+        "stage": name,
+        "items": items,
+        "unit": unit,
+        "seconds": round(seconds, 4),
+        "per_sec": round(items / seconds, 1) if seconds > 0 else None,
+        "peak_mb": peak_mb,
+    }
+
+
+def run(root, workers=None, memory=True, batch_size=1000):
+    stages = []
+
+    files, st = _stage("find_js_files", lambda: find_js_files(root), len, memory, "files")
+    stages.append(st)
+
+    sources = []
+    for path in files:
+        with open(path, "r", encoding="utf-8") as f:
+            sources.append((path, f.read()))
+    total_bytes = sum(len(code) for _, code in sources)
+
+    def parse_all():
+        routes = []
+        for path, code in sources:
+            routes.extend(parse_express_code(code, filename=path))
+        return routes
+
+    routes, st = _stage("parse_express_code", parse_all, len, memory, "routes")
+    st["mb_per_sec"] = round(total_bytes / 1e6 / st["seconds"], 2) if st["seconds"] else None
+    stages.append(st)
+
+    _, st = _stage("analyze_project", lambda: analyze_project(root, workers=workers), len, memory, "routes")
+    stages.append(st)
+
+    out_dir = tempfile.mkdtemp(prefix="authgraph_bench_out_")
+    try:
+        out = os.path.join(out_dir, "routes.csv")
+        _, st = _stage("export_to_csv", lambda: export_to_csv(routes, out), lambda _: len(routes), memory, "routes")
+        stages.append(st)
+        _, st = _stage("export_to_csv_stream", lambda: export_to_csv_stream(routes, out), lambda n: n, memory, "routes")
+        stages.append(st)
+    finally:
+        shutil.rmtree(out_dir, ignore_errors=True)
+
+    _, st = _stage("push_to_neo4j(stub)",
+                   lambda: push_to_neo4j(routes, graph=StubGraph(), batch_size=batch_size),
+                   lambda stats: stats["routes"], memory, "routes")
+    stages.append(st)
+
+    return {"files": len(files), "bytes": total_bytes, "routes": len(routes), "stages": stages}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="AuthGraph tarayıcı benchmark'ı")
+    ap.add_argument("--files", type=int, default=200)
+    ap.add_argument("--routes", type=int, default=20, help="dosya başına rota")
+    ap.add_argument("--depth", type=int, default=1, help="router mount derinliği")
+    ap.add_argument("--chain-ratio", type=float, default=0.3, help="route() zinciri oranı (0-1)")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--batch-size", type=int, default=1000)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--no-memory", action="store_true", help="tepe bellek ölçümünü atla")
+    ap.add_argument("--out", help="JSON çıktı dosyası (varsayılan: stdout)")
+    args = ap.parse_args(argv)
+
+    root = tempfile.mkdtemp(prefix="authgraph_bench_")
+    try:
+        expected = generate_project(root, files=args.files, routes_per_file=args.routes,
+                                    mount_depth=args.depth, chain_ratio=args.chain_ratio, seed=args.seed)
+        report = run(root, workers=args.workers, memory=not args.no_memory, batch_size=args.batch_size)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    report["expected_routes"] = expected
+    report["params"] = {k: v for k, v in vars(args).items() if k != "out"}
+    report["python"] = platform.python_version()
+    report["cpus"] = os.cpu_count()
+
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
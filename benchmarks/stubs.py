@@ -0,0 +1,115 @@
+"""Neo4j ve Ollama yerine kullanılan yerel sahte servisler (ağ / veritabanı gerektirmez)."""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from authgraph.scanner.express_parser import parse_express_code
+
+
+class _Result:
+    def __init__(self, value=None):
+        self.value = value
+
+    def evaluate(self):
+        return self.value
+
+
+class StubGraph:
+    """
+    py2neo Graph'ın writer'ın kullandığı kısmını taklit eder (run/begin/commit).
+    Gönderilen sorgu ve satır sayılarını sayar.
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.rows = 0
+        self.commits = 0
+
+    def run(self, query, **params):
+        self.queries += 1
+        self.rows += len(params.get("rows") or ())
+        return _Result(0)
+
+    def begin(self):
+        return self
+
+    def commit(self, tx):
+        self.commits += 1
+
+
+class StubOllama:
+    """
+    Ollama'nın /api/generate uç noktasını taklit eden yerel HTTP sunucusu.
+    Prompt'taki kodu regex parser ile işleyip JSON cevap döndürür; gelen istek
+    sayısını ve en yüksek eş zamanlı istek sayısını sayar.
+
+        with StubOllama() as ollama:
+            parse_express_code_ai(code, base_url=ollama.url, use_cache=False)
+    """
+
+    def __init__(self, delay: float = 0.0, fail_first: int = 0):
+        self.delay = delay
+        self.fail_first = fail_first
+        self.requests = 0
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+        self.server = None
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _respond(self, body: dict):
+        with self.lock:
+            self.requests += 1
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            failing = self.requests <= self.fail_first
+        try:
+            time.sleep(self.delay)
+            if failing:
+                return 500, {"error": "stub failure"}
+            prompt = body.get("prompt", "")
+            code = prompt.split("CODE (filename: ", 1)[-1].split("\n", 1)[-1]
+            routes = [{k: r[k] for k in ("line", "source", "method", "path", "roles", "role")}
+                      for r in parse_express_code(code, "<stub>")]
+            return 200, {"response": json.dumps({"routes": routes})}
+        finally:
+            with self.lock:
+                self.active -= 1
+
+    def __enter__(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}")
+                status, payload = (404, {"error": "not found"})
+                if self.path == "/api/generate":
+                    status, payload = stub._respond(body)
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
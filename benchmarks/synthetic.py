@@ -0,0 +1,88 @@
+"""
+Ölçeklenebilir sentetik Express projesi üretici.
+
+    generate_project("/tmp/bench", files=500, routes_per_file=20, mount_depth=2, chain_ratio=0.3)
+
+Her dosya bir router tanımlar; `mount_depth` kadar iç içe alt router aynı
+dosyada `.use()` ile bağlanır. Rotaların `chain_ratio` kadarı
+`router.route('/x').get(...).post(...)` zinciri, kalanı basit çağrıdır.
+Kök `app.js` tüm router'ları require edip mount eder.
+"""
+import os
+import random
+
+ROLES = ["admin", "user", "editor", "viewer", "ops", "billing", "support"]
+METHODS = ["get", "post", "put", "delete", "patch"]
+
+
+def _route_lines(var, idx, rng, chain_ratio):
+    """(satırlar, tanımlanan rota sayısı); route() zinciri iki metod tanımlar."""
+    role = rng.choice(ROLES)
+    if rng.random() < chain_ratio:
+        m1, m2 = rng.sample(METHODS, 2)
+        return [
+            f"{var}.route('/res{idx}/:id')",
+            f"  .{m1}(checkRole('{role}'), (req, res) => res.json({{ ok: true }}))",
+            f"  .{m2}(checkRole('{rng.choice(ROLES)}'), (req, res) => res.send(\"done\"));",
+        ], 2
+    method = rng.choice(METHODS)
+    return [
+        f"{var}.{method}(`/res{idx}/items`, checkRole(\"{role}\"), async (req, res) => {{",
+        f"  const data = await db.find({{ id: req.params.id, tag: 'x({idx})' }});",
+        "  res.json(data);",
+        "});",
+    ], 1
+
+
+def generate_file(file_idx, routes_per_file, mount_depth, chain_ratio, rng):
+    """(dosya içeriği, dosyadaki rota kaydı sayısı)."""
+    lines = [
+        "const express = require('express');",
+        "const { checkRole } = require('../middleware/auth');",
+        "const router = express.Router();",
+        "",
+    ]
+    routers = ["router"]
+    for d in range(1, mount_depth + 1):
+        lines.append(f"const sub{d} = express.Router();")
+        lines.append(f"{routers[-1]}.use('/level{d}', sub{d});")
+        routers.append(f"sub{d}")
+    lines.append("")
+    count = 0
+    for i in range(routes_per_file):
+        route_lines, n = _route_lines(routers[i % len(routers)], i, rng, chain_ratio)
+        lines.extend(route_lines)
+        lines.append("")
+        count += n
+    lines.append("module.exports = router;")
+    return "\n".join(lines) + "\n", count
+
+
+def generate_project(root, files=100, routes_per_file=10, mount_depth=1, chain_ratio=0.3, seed=42):
+    """
+    Projeyi `root` altına yazar; parser'ın üretmesi gereken rota kaydı sayısını
+    döndürür (route() zincirindeki her metod ayrı kayıt, /health dahil).
+    """
+    rng = random.Random(seed)
+    routes_dir = os.path.join(root, "routes")
+    os.makedirs(routes_dir, exist_ok=True)
+
+    app_lines = ["const express = require('express');", "const app = express();", ""]
+    total = 1   # /health
+    for i in range(files):
+        # dosyaları birkaç alt klasöre dağıt (gerçekçi dizin ağacı)
+        sub = os.path.join(routes_dir, f"group{i % 10}")
+        os.makedirs(sub, exist_ok=True)
+        with open(os.path.join(sub, f"r{i}.js"), "w", encoding="utf-8") as f:
+            text, count = generate_file(i, routes_per_file, mount_depth, chain_ratio, rng)
+            f.write(text)
+        total += count
+        app_lines.append(f"const r{i} = require('./routes/group{i % 10}/r{i}');")
+        app_lines.append(f"app.use('/svc{i}', r{i});")
+
+    app_lines.append("")
+    app_lines.append("app.get('/health', (req, res) => res.send('ok'));")
+    app_lines.append("app.listen(3000);")
+    with open(os.path.join(root, "app.js"), "w", encoding="utf-8") as f:
+        f.write("\n".join(app_lines) + "\n")
+    return total
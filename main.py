@@ -1,13 +1,112 @@
+from authgraph.core.analyzer import ScanReport, analyze_project, iter_project_routes
+from authgraph.core.neo4j_writer import sync_to_neo4j
+from authgraph.core.profiler import DEFAULT_SLOWEST, ScanProfile
+from authgraph.core.watch import LiveProject
+from authgraph.exporter.csv_exporter import export_to_csv_stream
+from authgraph.exporter.jsonl_exporter import export_to_jsonl
+from authgraph.exporter.parquet_exporter import ARROW_EXTENSIONS, export_to_parquet
+import argparse
+import json
+import os
+
+DEFAULT_OUT = "output/permissions.csv"
+
+
+def build_parser():
+    ap = argparse.ArgumentParser(description="Express projelerinden rota / rol haritası çıkarır.")
+    ap.add_argument("project", help="proje klasörü")
+    ap.add_argument("out", nargs="?", default=DEFAULT_OUT, help="çıktı .csv, .jsonl, .parquet ya da .arrow")
+    ap.add_argument("--stream", action="store_true",
+                    help="sabit bellekle dosya dosya yaz (dosyalar arası mount çözümlemesi yapılmaz)")
+    ap.add_argument("--append", action="store_true",
+                    help="out'u Parquet dataset klasörü say ve sonuçları yeni bir parça olarak ekle")
+    ap.add_argument("--ai", action="store_true",
+                    help="hibrit mod: regex'in emin olamadığı rota çağrılarını Ollama ile tamamla")
+    ap.add_argument("--report", metavar="JSON",
+                    help="tarama raporunu (aşama süreleri, en yavaş dosyalar, hatalar) JSON olarak yaz")
+    ap.add_argument("--slowest", type=int, default=DEFAULT_SLOWEST, help="raporda listelenecek en yavaş dosya sayısı")
+    ap.add_argument("--cprofile", metavar="PROF",
+                    help="cProfile ile izle ve .prof dosyası yaz (tam profil için tek process'te tarar)")
+    ap.add_argument("--watch", action="store_true",
+                    help="ilk taramadan sonra değişiklikleri izle; out'u (ve Neo4j'yi) güncel tut")
+    ap.add_argument("--sync-neo4j", metavar="SNAPSHOT",
+                    help="Neo4j'ye yalnızca son taramaya göre farkı yaz (önceki durum bu JSON dosyasında tutulur)")
+    ap.add_argument("--cache", metavar="JSON", help="parse cache dosyası; yalnızca değişen dosyalar yeniden parse edilir")
+    return ap
+
+
+def export(routes, out, append=False):
+    if append or out.endswith((".parquet",) + ARROW_EXTENSIONS):
+        return export_to_parquet(routes, out, append=append)
+    if out.endswith(".jsonl"):
+        return export_to_jsonl(routes, out)
+    return export_to_csv_stream(routes, out)
+
+
+def watch(args):
+    def show(summary):
+        neo = summary.get("neo4j")
+        extra = f", neo4j: {neo}" if isinstance(neo, str) else ""
+        print(f"🔄 {summary['files']} dosya, {summary['routes']} rota "
+              f"(+{summary['changed']} / -{summary['removed']} dosya) {summary['seconds']} sn{extra}", flush=True)
+
+    live = LiveProject(args.project, out_path=args.out, export=export, snapshot_path=args.sync_neo4j,
+                       cache_path=args.cache, on_update=show)
+    print(f"👀 {args.project} izleniyor (Ctrl+C ile çık)", flush=True)
+    try:
+        live.watch()
+    except KeyboardInterrupt:
+        pass
+
+
+def write_report(path, report, profile, total):
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"routes": total, "scan": report.to_dict(), "profile": profile.to_dict(report)},
+                  f, ensure_ascii=False, indent=2)
 
-from accessmap.core.analyzer import analyze_project
-from accessmap.exporter.csv_exporter import export_to_csv
-import sys
 
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Kullanım: python main.py <proje_klasörü>")
+    parser = build_parser()
+    args = parser.parse_args()
+    if args.watch:
+        if args.append or args.stream:
+            parser.error("--watch, --append / --stream ile birlikte kullanılamaz")
+        watch(args)
+        raise SystemExit(0)
+    if args.sync_neo4j and args.stream:
+        parser.error("--sync-neo4j, --stream ile birlikte kullanılamaz (graph farkı için tüm rotalar gerekir)")
+    report = ScanReport()
+    profile = ScanProfile(slowest=args.slowest, cprofile=bool(args.cprofile))
+    options = dict(hybrid=args.ai, report=report, profile=profile, cache_path=args.cache)
+    if args.cprofile:
+        options["workers"] = 1   # worker process'ler cProfile'a görünmez
+    if args.stream:
+        # Rotalar tarama sürerken diske akar; tüm liste bellekte tutulmaz.
+        # export süresine tarama da dahil olmasın diye tarama ayrıca ölçülür.
+        routes = profile.timed(iter_project_routes(args.project, **options), "scan")
+        with profile.stage("export"):
+            total = export(routes, args.out, append=args.append)
+        profile.add_time("export", -profile.stages["scan"])
     else:
-        path = sys.argv[1]
-        routes = analyze_project(path)
-        export_to_csv(routes)
-        print("✅ CSV oluşturuldu. Toplam rota:", len(routes))
+        routes = analyze_project(args.project, **options)
+        with profile.stage("export"):
+            total = export(routes, args.out, append=args.append)
+        if args.sync_neo4j:
+            with profile.stage("neo4j"):
+                stats = sync_to_neo4j(routes, args.sync_neo4j)
+            print(f"🔗 Neo4j farkı uygulandı: {stats}")
+    profile.finish()
+
+    print(f"✅ {args.out} oluşturuldu. Toplam rota:", total)
+    if report.errors or report.skipped:
+        print(f"⚠️ {len(report.errors)} dosya okunamadı, {len(report.skipped)} dosya atlandı")
+    if report.warnings:
+        print(f"⚠️ {len(report.warnings)} dosya kodlama hatasıyla (U+FFFD ile) okundu")
+    if args.report:
+        write_report(args.report, report, profile, total)
+        print(f"📊 Rapor: {args.report}")
+    if args.cprofile:
+        profile.dump_cprofile(args.cprofile)
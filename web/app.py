@@ -1,36 +1,142 @@
-import zipfile
 import tempfile
-from flask import Flask, render_template, request, send_file
-import os
-from authgraph.core.analyzer import analyze_project
-from authgraph.exporter.csv_exporter import export_to_csv
-from authgraph.core.neo4j_writer import push_to_neo4j
+from flask import Flask, abort, jsonify, redirect, render_template, request, send_file, url_for
+from werkzeug.utils import secure_filename
+from authgraph.scanner.archive_scanner import is_archive_name, is_js_name
+from web.jobs import JobManager
 
 app = Flask(__name__)
 UPLOAD_FOLDER = tempfile.mkdtemp()
+JOBS = JobManager(UPLOAD_FOLDER)
+DEFAULT_PER_PAGE = 50
+MAX_PER_PAGE = 500
+
+
+def _submit_upload():
+    """
+    Yüklemeler diske açılmaz: .js dosyaları bellekte tutulur, zip/tar arşivleri
+    tek parça kaydedilip doğrudan içinden okunur. Diğer dosyalar hiç okunmaz.
+    """
+    job = JOBS.create()
+    for file in request.files.getlist("folder") + request.files.getlist("archive"):
+        name = file.filename or ""
+        if is_archive_name(name):
+            file.save(job.add_archive(secure_filename(name)))
+        elif is_js_name(name):
+            job.sources.append((name, file.read()))
+    JOBS.start(job)
+    return job
+
+
+def _job_or_404(job_id):
+    job = JOBS.get(job_id)
+    if job is None:
+        abort(404)
+    return job
+
+
+def _filtered_routes(job):
+    """
+    ?role=admin          -> rolün erişebildiği rotalar
+    ?path=/admin/*       -> path / prefix altındaki rotalar
+    ?match=/users/42     -> somut isteği karşılayan rotalar
+    (method=GET ile daraltılabilir)
+    """
+    index = job.index
+    method = request.args.get("method")
+    if "role" in request.args:
+        return index.routes_for_role(request.args["role"] or None, method)
+    if "path" in request.args:
+        hits = index.routes_under(request.args["path"])
+        if method:
+            hits = [r for r in hits if r.get("method") == method.upper()]
+        return hits
+    if "match" in request.args:
+        return index.match(request.args["match"], method)
+    return index.routes
+
 
 @app.route("/", methods=["GET", "POST"])
 def index():
-    routes = []
     if request.method == "POST":
-        folder_files = request.files.getlist("folder")
-        temp_dir = os.path.join(UPLOAD_FOLDER, "session")
-        os.makedirs(temp_dir, exist_ok=True)
+        job = _submit_upload()
+        return redirect(url_for("index", job=job.id))
+    return render_template("index.html", job_id=request.args.get("job"))
+
+
+@app.route("/jobs", methods=["POST"])
+def create_job():
+    job = _submit_upload()
+    return jsonify(job.to_dict()), 202
+
 
-        for file in folder_files:
-            path = os.path.join(temp_dir, file.filename)
-            os.makedirs(os.path.dirname(path), exist_ok=True)
-            file.save(path)
+@app.route("/jobs/<job_id>")
+def job_status(job_id):
+    return jsonify(_job_or_404(job_id).to_dict())
 
-        routes = analyze_project(temp_dir)
-        export_to_csv(routes, os.path.join(UPLOAD_FOLDER, "permissions.csv"))
-        push_to_neo4j(routes)
 
-    return render_template("index.html", routes=routes)
+@app.route("/jobs/<job_id>/routes")
+def job_routes(job_id):
+    job = _job_or_404(job_id)
+    if job.status != "done":
+        return jsonify(job.to_dict()), 409
+    hits = _filtered_routes(job)
+    page = max(1, request.args.get("page", 1, type=int))
+    per_page = min(MAX_PER_PAGE, max(1, request.args.get("per_page", DEFAULT_PER_PAGE, type=int)))
+    start = (page - 1) * per_page
+    return jsonify({
+        "page": page,
+        "per_page": per_page,
+        "total": len(hits),
+        "items": [dict(r) for r in hits[start:start + per_page]],
+    })
+
+
+@app.route("/jobs/<job_id>/profile")
+def job_profile(job_id):
+    """Aşama süreleri, en yavaş dosyalar ve hata sayıları (?slowest=N); hatalar ve atlananlar tam liste."""
+    job = _job_or_404(job_id)
+    profile = job.profile.to_dict(job.report)
+    slowest = request.args.get("slowest", type=int)
+    if slowest is not None:
+        profile["slowest_files"] = profile["slowest_files"][:max(0, slowest)]
+    return jsonify({"id": job.id, "status": job.status, "scan": job.report.to_dict(), "profile": profile})
+
+
+@app.route("/jobs/<job_id>/download")
+def job_download(job_id):
+    job = _job_or_404(job_id)
+    if job.status != "done":
+        abort(409)
+    return send_file(job.csv_path, as_attachment=True)
+
 
 @app.route("/download")
 def download():
-    return send_file(os.path.join(UPLOAD_FOLDER, "permissions.csv"), as_attachment=True)
+    job = JOBS.latest_done()
+    if job is None:
+        abort(404)
+    return send_file(job.csv_path, as_attachment=True)
+
+
+@app.route("/api/routes")
+def api_routes():
+    """Son biten taramanın (ya da ?job=<id>) rotaları; filtreler _filtered_routes'ta."""
+    job = JOBS.get(request.args["job"]) if "job" in request.args else JOBS.latest_done()
+    if job is None or job.status != "done":
+        return jsonify([])
+    return jsonify([dict(r) for r in _filtered_routes(job)])
+
+
+@app.route("/api/roles")
+def api_roles():
+    """?path=/admin/* -> o path'e erişebilen roller; parametresiz -> tüm roller"""
+    job = JOBS.get(request.args["job"]) if "job" in request.args else JOBS.latest_done()
+    if job is None or job.status != "done":
+        return jsonify([])
+    if "path" in request.args:
+        roles = job.index.roles_for_path(request.args["path"])
+        return jsonify(sorted(r for r in roles if r is not None) + ([None] if None in roles else []))
+    return jsonify(job.index.roles())
 
 if __name__ == "__main__":
-    app.run(debug=True)
\ No newline at end of file
+    app.run(debug=True)
@@ -0,0 +1,171 @@
+import os
+import shutil
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from authgraph.core.analyzer import ScanReport, analyze_sources
+from authgraph.core.index import AuthIndex
+from authgraph.core.profiler import ScanProfile
+from authgraph.core.neo4j_writer import sync_to_neo4j
+from authgraph.exporter.csv_exporter import export_to_csv
+from authgraph.scanner.archive_scanner import count_archive_sources, iter_archive_sources
+from authgraph.scanner.file_scanner import DEFAULT_MAX_BYTES
+
+JOB_WORKERS = int(os.getenv("AUTHGRAPH_JOB_WORKERS", "4"))
+MAX_JOBS = int(os.getenv("AUTHGRAPH_MAX_JOBS", "50"))
+PUSH_TO_NEO4J = os.getenv("AUTHGRAPH_PUSH_NEO4J", "1") == "1"
+
+# Graph'ın son yazılan hâli (sync_to_neo4j snapshot'ı); yoksa iş klasörlerinin kökünde tutulur
+NEO4J_SNAPSHOT = os.getenv("AUTHGRAPH_NEO4J_SNAPSHOT")
+
+# Graph tüm işler için ortaktır: push'lar sırayla yapılır ki eş zamanlı işler
+# birbirinin yazdığını yarıda silmesin ve snapshot graph'la tutarlı kalsın.
+# Graph'ta son biten işin rotaları kalır.
+_neo4j_lock = threading.Lock()
+
+
+class Job:
+    """Tek bir yükleme/tarama işi. Alanlar worker thread tarafından güncellenir."""
+
+    def __init__(self, root: str):
+        self.id = uuid.uuid4().hex
+        self.dir = os.path.join(root, self.id)
+        self.status = "queued"          # queued -> running -> done | failed
+        self.sources = []               # bellekteki (isim, bytes) .js yüklemeleri
+        self.archives = []              # diske tek parça kaydedilmiş zip/tar yolları
+        self.files_total = 0
+        self.files_done = 0
+        self.routes = []
+        self.index = AuthIndex()
+        self.report = ScanReport()
+        self.profile = ScanProfile()
+        self.error = None
+        self.neo4j = None               # push sonucu ya da hata mesajı
+        self.created = time.time()
+        self.finished = None
+
+    @property
+    def csv_path(self):
+        return os.path.join(self.dir, "permissions.csv")
+
+    def add_archive(self, filename: str) -> str:
+        """Arşivin (açılmadan) kaydedileceği yolu döndürür."""
+        path = os.path.join(self.dir, f"upload{len(self.archives)}-{filename}")
+        self.archives.append(path)
+        return path
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "status": self.status,
+            "progress": {"done": self.files_done, "total": self.files_total},
+            "routes": len(self.routes),
+            "errors": len(self.report.errors),
+            "error": self.error,
+            "neo4j": self.neo4j,
+            "created": self.created,
+            "finished": self.finished,
+        }
+
+
+class JobManager:
+    """
+    Taramaları istek thread'i dışında, sınırlı bir thread havuzunda çalıştırır.
+    Her iş kendi klasörünü kullanır; eş zamanlı yüklemeler birbirini ezmez.
+    Neo4j ise ortaktır: push'lar sıraya girer ve graph son biten işi gösterir.
+    Graph silinip yeniden kurulmaz; önceki işin snapshot'ına göre yalnızca fark
+    yazılır (graph başka bir araçla değiştirilirse snapshot dosyası silinmelidir).
+    """
+
+    def __init__(self, root: str, workers: int = JOB_WORKERS, max_jobs: int = MAX_JOBS,
+                 snapshot_path: str = NEO4J_SNAPSHOT):
+        self.root = root
+        self.snapshot_path = snapshot_path or os.path.join(root, "neo4j_snapshot.json")
+        self.max_jobs = max_jobs
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scan-job")
+        self.jobs = OrderedDict()
+        self.lock = threading.Lock()
+
+    def create(self) -> Job:
+        job = Job(self.root)
+        os.makedirs(job.dir, exist_ok=True)
+        with self.lock:
+            self.jobs[job.id] = job
+            self._evict()
+        return job
+
+    def get(self, job_id):
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def latest_done(self):
+        with self.lock:
+            for job in reversed(self.jobs.values()):
+                if job.status == "done":
+                    return job
+        return None
+
+    def start(self, job: Job):
+        self.pool.submit(self._run, job)
+
+    def _evict(self):
+        # en eski bitmiş işler (ve klasörleri) silinir
+        for job_id in list(self.jobs):
+            if len(self.jobs) <= self.max_jobs:
+                break
+            job = self.jobs[job_id]
+            if job.status in ("done", "failed"):
+                del self.jobs[job_id]
+                shutil.rmtree(job.dir, ignore_errors=True)
+
+    def _progress(self, job):
+        def update(done):
+            job.files_done = done
+            # tar üyelerinin sayısı önceden bilinmez
+            job.files_total = max(job.files_total, done)
+        return update
+
+    def _sources(self, job: Job):
+        yield from job.sources
+        for path in job.archives:
+            with open(path, "rb") as f:
+                # boyut sınırını aşan üyeler hiç açılmaz (zip bombası vb.)
+                yield from iter_archive_sources(f, DEFAULT_MAX_BYTES, job.report.add_skipped)
+
+    def _count(self, job: Job):
+        total = len(job.sources)
+        for path in job.archives:
+            with open(path, "rb") as f:
+                total += count_archive_sources(f) or 0
+        return total
+
+    def _run(self, job: Job):
+        job.status = "running"
+        try:
+            job.files_total = self._count(job)
+            profile = job.profile = ScanProfile()   # kuyrukta beklenen süre sayılmasın
+            routes = analyze_sources(self._sources(job), report=job.report,
+                                     progress=self._progress(job), profile=profile)
+            job.sources = []
+            with profile.stage("export"):
+                export_to_csv(routes, job.csv_path)
+            with profile.stage("index"):
+                job.index = AuthIndex(routes)
+            job.routes = routes
+            if PUSH_TO_NEO4J:
+                try:
+                    with _neo4j_lock, profile.stage("neo4j"):
+                        job.neo4j = sync_to_neo4j(routes, self.snapshot_path)
+                except Exception as e:
+                    # graph erişilemese de tarama sonucu kullanılabilir kalır
+                    job.neo4j = f"{type(e).__name__}: {e}"
+            job.status = "done"
+        except Exception as e:
+            job.error = f"{type(e).__name__}: {e}"
+            job.status = "failed"
+        finally:
+            job.profile.finish()
+            job.finished = time.time()
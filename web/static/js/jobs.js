@@ -0,0 +1,53 @@
+const jobId = document.getElementById("job").dataset.jobId;
+const perPage = 50;
+let page = 1;
+
+function cell(text) {
+  const td = document.createElement("td");
+  td.textContent = text == null ? "" : text;
+  return td;
+}
+
+function loadPage(p) {
+  fetch(`/jobs/${jobId}/routes?page=${p}&per_page=${perPage}`)
+    .then(res => res.json())
+    .then(data => {
+      page = data.page;
+      const body = document.getElementById("routes");
+      body.replaceChildren();
+      data.items.forEach(r => {
+        const tr = document.createElement("tr");
+        tr.append(cell(r.role), cell(r.path), cell(r.method));
+        body.append(tr);
+      });
+      const pages = Math.max(1, Math.ceil(data.total / perPage));
+      document.getElementById("page-info").textContent = `${page} / ${pages} (${data.total} routes)`;
+      document.getElementById("prev").disabled = page <= 1;
+      document.getElementById("next").disabled = page >= pages;
+      document.getElementById("results").classList.remove("d-none");
+    });
+}
+
+function poll() {
+  fetch(`/jobs/${jobId}`)
+    .then(res => res.json())
+    .then(job => {
+      const { done, total } = job.progress;
+      const pct = total ? Math.round((100 * done) / total) : 0;
+      document.getElementById("job-progress").style.width = `${pct}%`;
+      const status = document.getElementById("job-status");
+      if (job.status === "done") {
+        status.textContent = `Done: ${job.routes} routes in ${total} files` + (job.errors ? `, ${job.errors} file errors` : "");
+        loadPage(1);
+      } else if (job.status === "failed") {
+        status.textContent = `Failed: ${job.error}`;
+      } else {
+        status.textContent = `${job.status}... ${done} / ${total} files`;
+        setTimeout(poll, 1000);
+      }
+    });
+}
+
+document.getElementById("prev").addEventListener("click", () => loadPage(page - 1));
+document.getElementById("next").addEventListener("click", () => loadPage(page + 1));
+poll();